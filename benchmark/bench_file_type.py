@@ -0,0 +1,70 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Benchmark for file type classification.
+
+Compares the FileTypeClassifier index with a linear scan of the FileType enum,
+as LicenseManager.get_file_type used to do, over a mix of supported and
+unsupported file names.
+
+Usage:
+    python -m benchmark.bench_file_type [--count 1000000]
+"""
+import argparse
+import os
+import time
+from src.license_manager import FileType, FileTypeClassifier
+
+FILE_NAMES = [
+    "main.py", "lib.CPP", "index.d.ts", "app.js", "style.css", "page.html",
+    "Makefile", "Dockerfile", "values.yaml", "data.json", "image.png", "README",
+]
+
+
+def linear_scan(file_path: str):
+    """Classify a file by scanning every FileType member, the way it was done before."""
+    file_extension = os.path.splitext(file_path)[1]
+    for file_type in FileType:
+        if file_extension == file_type.extension:
+            return file_type
+    return None
+
+
+def _time(classify, paths) -> float:
+    """Return the time taken to classify every path."""
+    start = time.perf_counter()
+    for path in paths:
+        classify(path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    paths = [
+        f"project/module{index % 97}/{FILE_NAMES[index % len(FILE_NAMES)]}"
+        for index in range(args.count)
+    ]
+    classifier = FileTypeClassifier()
+
+    for name, classify in (("linear scan", linear_scan), ("classifier", classifier.classify)):
+        elapsed = _time(classify, paths)
+        print(f"{name:>12}: {elapsed:.3f}s, {args.count / elapsed:,.0f} paths/s")
+
+
+if __name__ == "__main__":
+    main()
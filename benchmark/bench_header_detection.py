@@ -0,0 +1,83 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Benchmark for license header detection on files of growing size.
+
+For each size, two licensed files are generated: one with many short lines and one
+made of a single enormous line (like minified JavaScript). The time and the peak
+memory allocated while detecting the header are reported. Both should stay flat
+as the file size grows, since detection only reads a bounded prefix.
+
+Usage:
+    python -m benchmark.bench_header_detection [--sizes-mb 1 10 100]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from src.license_manager import FileType, LicenseManager
+
+LICENSE_TEXT = "MIT License\nCopyright 2015-2024 Microsoft Corporation"
+
+
+def _write_file(path: str, size: int, single_line: bool):
+    """Write a licensed JavaScript file of roughly the given size."""
+    chunk = "var a=1;" * 128 if single_line else "var a = 1;\n" * 128
+    with open(path, "w") as f:
+        f.write("/*\n * MIT License\n * Copyright 2015-2024 Microsoft Corporation\n */\n")
+        written = 0
+        while written < size:
+            f.write(chunk)
+            written += len(chunk)
+
+
+def _measure(manager: LicenseManager, path: str):
+    """Return the time and peak traced memory of one header detection."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        found = manager.is_license_in_lines(
+            manager.iter_header_lines(file), FileType.JAVASCRIPT
+        )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert found, f"License not detected in {path}"
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    manager = LicenseManager(LICENSE_TEXT)
+    print(f"{'size':>8} {'layout':>12} {'time (ms)':>10} {'peak (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size_mb in args.sizes_mb:
+            for single_line in (False, True):
+                path = os.path.join(folder, "bundle.js")
+                _write_file(path, size_mb * 1024 * 1024, single_line)
+                elapsed, peak = _measure(manager, path)
+                layout = "single line" if single_line else "many lines"
+                print(
+                    f"{size_mb:>6}MB {layout:>12} {elapsed * 1000:>10.2f} {peak / 1024:>11.1f}"
+                )
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
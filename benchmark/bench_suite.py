@@ -0,0 +1,193 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Benchmark suite for walk, detect and insert throughput on synthetic trees.
+
+A tree of synthetic files is generated with a configurable number of files, file
+size, extension mix and share of files that already carry the license. Then:
+- auto_license is run end to end through main.py, twice: a cold run that adds the
+  missing headers and a warm run where every header is present;
+- LicenseManager.is_license_present, LicenseManager.format_license_with_comments and
+  LicenseGenerator.generate_license are timed on their own.
+
+The results, including files/sec and peak RSS, are written as JSON so that they
+can be compared across releases.
+
+Usage:
+    python -m benchmark.bench_suite [--files 2000] [--file-size 4096]
+                                    [--extensions py:4,js:3,c:2,html:1,txt:1]
+                                    [--licensed 0.5] [--jobs N] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+from src.license_generator import LicenseGenerator
+from src.license_manager import CommentStyle, LicenseManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LICENSE_FILE = os.path.join(ROOT, "data", "license.json")
+LICENSE_TYPE = "MIT License"
+AUTHOR = "Benchmark Author"
+START_YEAR = 2020
+FILES_PER_FOLDER = 100
+
+
+def parse_extensions(value: str) -> dict:
+    """Parse an extension mix such as 'py:4,js:3' into {'.py': 4, '.js': 3}."""
+    mix = {}
+    for item in value.split(","):
+        extension, _, weight = item.partition(":")
+        mix["." + extension.strip().lstrip(".")] = int(weight or 1)
+    return mix
+
+
+def generate_tree(folder: str, files: int, file_size: int, extensions: dict,
+                  licensed: float, manager: LicenseManager, seed: int = 0) -> int:
+    """
+    Generate the synthetic tree, FILES_PER_FOLDER files per folder.
+    :return: The total number of bytes written
+    """
+    rng = random.Random(seed)
+    names, weights = list(extensions), list(extensions.values())
+    line = b"value = compute(value, 42)  # synthetic line of code\n"
+    body = (line * (file_size // len(line) + 1))[:file_size]
+    total = 0
+    for index in range(files):
+        extension = rng.choices(names, weights)[0]
+        sub_folder = os.path.join(folder, f"module{index // FILES_PER_FOLDER:05d}")
+        if index % FILES_PER_FOLDER == 0:
+            os.makedirs(sub_folder, exist_ok=True)
+        content = body
+        file_type = manager.classifier.classify_extension(extension)
+        if file_type is not None and rng.random() < licensed:
+            content = manager.headers[file_type.comment_style] + body
+        with open(os.path.join(sub_folder, f"file{index:07d}{extension}"), "wb") as f:
+            f.write(content)
+        total += len(content)
+    return total
+
+
+def run_end_to_end(folder: str, files: int, jobs: int) -> dict:
+    """Run main.py on the tree in a child process and measure it."""
+    command = [
+        sys.executable, os.path.join(ROOT, "main.py"),
+        f"--license-file={LICENSE_FILE}", f"--license-type={LICENSE_TYPE}",
+        f"--start-year={START_YEAR}", f"--author={AUTHOR}",
+        f"--target-folder={folder}", f"--jobs={jobs}",
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    # The rusage of this child only: RUSAGE_CHILDREN would give the largest
+    # child so far as its peak RSS
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return {
+        "seconds": elapsed,
+        "files_per_second": files / elapsed,
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_kib": usage.ru_maxrss,
+    }
+
+
+def time_call(function, number: int) -> dict:
+    """Time a function call, best of 5 repeats."""
+    best = min(timeit.repeat(function, number=number, repeat=5)) / number
+    return {"seconds_per_call": best, "calls_per_second": 1 / best if best else None}
+
+
+def run_micro_benchmarks(manager: LicenseManager, generator: LicenseGenerator) -> dict:
+    """Time the detection, formatting and generation functions on their own."""
+    results = {}
+    file_type = manager.classifier.classify_extension(".py")
+    licensed = (manager.headers[file_type.comment_style] + b"x = 1\n" * 200).decode()
+    unlicensed = "x = 1\n" * 200
+    results["is_license_present.licensed"] = time_call(
+        lambda: manager.is_license_present(licensed, file_type), 20_000
+    )
+    results["is_license_present.unlicensed"] = time_call(
+        lambda: manager.is_license_present(unlicensed, file_type), 20_000
+    )
+    for comment_style in CommentStyle:
+        results[f"format_license_with_comments.{comment_style.name}"] = time_call(
+            lambda style=comment_style: manager.format_license_with_comments(style.value),
+            20_000,
+        )
+    results["generate_license"] = time_call(generator.generate_license, 20_000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-size", type=int, default=4096)
+    parser.add_argument("--extensions", type=parse_extensions,
+                        default=parse_extensions("py:4,js:3,c:2,html:1,txt:1"))
+    parser.add_argument("--licensed", type=float, default=0.5,
+                        help="Share of the supported files that already carry the license")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    generator = LicenseGenerator(LICENSE_FILE, LICENSE_TYPE, START_YEAR, author=AUTHOR)
+    manager = LicenseManager(generator.generate_license())
+
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        total_bytes = generate_tree(folder, args.files, args.file_size, args.extensions,
+                                    args.licensed, manager)
+        generation_seconds = time.perf_counter() - start
+        cold = run_end_to_end(folder, args.files, args.jobs)
+        warm = run_end_to_end(folder, args.files, args.jobs)
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            "files": args.files,
+            "file_size": args.file_size,
+            "extensions": args.extensions,
+            "licensed": args.licensed,
+            "jobs": args.jobs,
+        },
+        "tree": {"bytes": total_bytes, "generation_seconds": generation_seconds},
+        "end_to_end": {"cold": cold, "warm": warm},
+        "micro": run_micro_benchmarks(manager, generator),
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Soak test checking that a run uses constant memory, however many files it processes.
+
+Millions of synthetic paths are streamed through the same stages as auto_license
+(prefetch, then LicenseManager.process_many), checking every file. The paths cycle
+over a pool of real files, so that no disk is needed for the whole tree. The RSS is
+sampled along the way, and the run fails if it grows by more than --max-growth-mb
+after the warm-up sample.
+
+Usage:
+    python -m benchmark.soak_pipeline [--files 5000000] [--pool 1000] [--jobs N]
+                                      [--sample-every 100000] [--max-growth-mb 32]
+                                      [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+from src.license_generator import LicenseGenerator
+from src.license_manager import LicenseManager
+from src.license_pipeline import prefetch
+from src.license_stats import LicenseStats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LICENSE_FILE = os.path.join(ROOT, "data", "license.json")
+LICENSE_TYPE = "MIT License"
+AUTHOR = "Benchmark Author"
+START_YEAR = 2020
+EXTENSIONS = (".py", ".js", ".c", ".html", ".txt")
+
+
+def rss_kib() -> int:
+    """The current resident set size, in KiB (Linux only)."""
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def generate_pool(folder: str, pool: int, manager: LicenseManager) -> list:
+    """Write the pool of real files, half of them licensed, and return their paths."""
+    body = b"value = compute(value, 42)  # synthetic line of code\n" * 20
+    paths = []
+    for index in range(pool):
+        extension = EXTENSIONS[index % len(EXTENSIONS)]
+        content = body
+        file_type = manager.classifier.classify_extension(extension)
+        if file_type is not None and index % 2:
+            content = manager.headers[file_type.comment_style] + body
+        path = os.path.join(folder, f"file{index:05d}{extension}")
+        with open(path, "wb") as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def synthetic_paths(pool: list, files: int):
+    """Yield the file paths, cycling over the pool, without ever holding them all."""
+    for index in range(files):
+        yield pool[index % len(pool)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5_000_000)
+    parser.add_argument("--pool", type=int, default=1000,
+                        help="Number of real files the synthetic paths cycle over")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sample-every", type=int, default=100_000)
+    parser.add_argument("--max-growth-mb", type=float, default=32.0,
+                        help="Largest RSS growth allowed after the first sample")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    generator = LicenseGenerator(LICENSE_FILE, LICENSE_TYPE, START_YEAR, author=AUTHOR)
+    stats = LicenseStats()
+    manager = LicenseManager(generator.generate_license(), stats=stats)
+
+    samples = []
+    statuses = {}
+    with tempfile.TemporaryDirectory() as folder:
+        pool = generate_pool(folder, args.pool, manager)
+        start = time.perf_counter()
+        file_paths = prefetch(stats.timed(synthetic_paths(pool, args.files), "walk"))
+        for count, result in enumerate(
+            manager.process_many(file_paths, args.jobs, manager.check_license), 1
+        ):
+            statuses[result.status.label] = statuses.get(result.status.label, 0) + 1
+            if count % args.sample_every == 0:
+                samples.append({"files": count, "seconds": time.perf_counter() - start,
+                                "rss_kib": rss_kib()})
+        elapsed = time.perf_counter() - start
+
+    baseline = samples[0]["rss_kib"] if samples else rss_kib()
+    growth_kib = max((sample["rss_kib"] for sample in samples), default=baseline) - baseline
+    passed = growth_kib <= args.max_growth_mb * 1024
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "files": args.files,
+            "pool": args.pool,
+            "jobs": args.jobs,
+            "sample_every": args.sample_every,
+            "max_growth_mb": args.max_growth_mb,
+        },
+        "seconds": elapsed,
+        "files_per_second": args.files / elapsed if elapsed else None,
+        "statuses": statuses,
+        "rss_growth_kib": growth_kib,
+        "passed": passed,
+        "samples": samples,
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,9 +20,28 @@ Usage:
                    --license-type=LICENSE_TYPE
                    --start-year=START_YEAR
                    --author=AUTHOR
-                   --target-folder=TARGET_FOLDER
+                   (--target-folder=TARGET_FOLDER | PATH... | --files-from=FILE)
                    [--end-year=END_YEAR]
                    [--detail]
+                   [--jobs=JOBS]
+                   [--manifest=MANIFEST]
+                   [--exclude-dir=NAME]
+                   [--no-default-excludes]
+                   [--skip-ext=EXTENSION]
+                   [--no-ignore-files]
+                   [--since=REF | --staged | --tracked-only]
+                   [--keyword=KEYWORD]
+                   [--update-years | --check]
+                   [--max-size=BYTES]
+                   [--stats=PATH]
+                   [--profile=cpu|mem]
+                   [--profile-output=PATH]
+                   [--catalog-cache=PATH]
+                   [--rules=FILE]
+                   [--watch]
+                   [--serve [--socket=PATH]]
+                   [--null]
+                   [--journal=PATH]
 
 Arguments:
     --license-file=LICENSE_FILE     Path to the license file (e.g., LICENSE.txt).
@@ -30,11 +49,58 @@ Arguments:
     --start-year=START_YEAR         The start year for the license period (e.g., 2024).
     --author=AUTHOR                 The name or organization that holds the copyright.
     --target-folder=TARGET_FOLDER   The folder containing the project files to which the 
-                                    license will be added.
+                                    license will be added. Optional when files are listed.
     --end-year=END_YEAR             (Optional) The end year for the license period. Defaults 
                                     to the current year if not provided.
     --detail                        (Optional) If provided, outputs more detailed information 
                                     about the process.
+    --jobs=JOBS                     (Optional) Number of files processed in parallel. Defaults 
+                                    to the CPU count.
+    --manifest=MANIFEST             (Optional) Path to a manifest file used to skip files 
+                                    unchanged since the last run.
+    --exclude-dir=NAME              (Optional) Name of a folder that is not entered. Can be 
+                                    repeated. Version control, dependency and build folders 
+                                    are excluded by default.
+    --no-default-excludes           (Optional) Also enter the folders excluded by default.
+    --skip-ext=EXTENSION            (Optional) Extension of files that are skipped. Can be 
+                                    repeated.
+    --no-ignore-files               (Optional) Do not honour the .gitignore and .licenseignore 
+                                    files found in the target folder.
+    --since=REF                     (Optional) Only process the files changed since a git 
+                                    reference (e.g., origin/main).
+    --staged                        (Optional) Only process the files staged in git.
+    --tracked-only                  (Optional) Only process the files tracked by git.
+    --keyword=KEYWORD               (Optional) Extra keyword marking an existing license header 
+                                    (e.g., SPDX-License-Identifier:). Can be repeated.
+    --update-years                  (Optional) Only update the end year of the existing 
+                                    copyright lines to the end year.
+    --check                         (Optional) Only list the files whose license is missing or 
+                                    out of date, without changing any file, and exit with 1 
+                                    if there are any.
+    --max-size=BYTES                (Optional) Files larger than this many bytes are skipped. 
+                                    Defaults to 10 MiB, 0 for no limit.
+    --stats=PATH                    (Optional) Write the timings and counters of the run, 
+                                    with the p50/p99 latency per file, to a JSON file.
+    --profile=cpu|mem               (Optional) Run under cProfile, writing a .pstats file, or 
+                                    under tracemalloc, printing the top allocation sites.
+    --profile-output=PATH           (Optional) The .pstats file written by --profile=cpu. 
+                                    Defaults to autolicense.pstats.
+    --catalog-cache=PATH            (Optional) Cache of the parsed license file, reused by later 
+                                    runs while the license file is unchanged.
+    --rules=FILE                    (Optional) JSON file mapping path patterns to the license 
+                                    type, author and years to use. The first matching rule wins.
+    --watch                         (Optional) After the first pass, keep running and process 
+                                    the files written in the target folder (Linux only).
+    --serve                         (Optional) Keep running and answer JSON-RPC requests (check, 
+                                    add, update-years), one per line, on the standard input.
+    --socket=PATH                   (Optional) With --serve, listen on a Unix socket instead.
+    PATH...                         (Optional) Files to process, instead of walking the 
+                                    target folder.
+    --files-from=FILE               (Optional) Read the files to process from FILE, one per 
+                                    line, '-' for the standard input.
+    --null, -0                      (Optional) The list of --files-from is NUL-separated.
+    --journal=PATH                  (Optional) Journal of the completed files: an interrupted 
+                                    run resumes where it stopped. Removed once the run completes.
 
 This script will insert the specified license header into each file in the target folder, 
 replacing any existing header with the updated license information.
@@ -43,7 +109,8 @@ Example usage:
     python main.py --license-file=LICENSE.txt --license-type=MIT --start-year=2024 
                    --author="John Doe" --target-folder="./src" --end-year=2025 --detail
 """
+import sys
 from src.auto_license import auto_license
 
 if __name__ == "__main__":
-    auto_license()
+    sys.exit(auto_license())
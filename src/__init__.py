@@ -19,10 +19,15 @@ Modules:
     - LicenseArgConfig: Handles and validates license-related arguments.
     - LicenseGenerator: Generates license headers based on provided details.
     - LicenseManager: Applies license headers to project files.
+    - FileTypeClassifier: Maps file names to their file type and comment style.
+    - LicenseManifest: Remembers licensed files to skip them on the next run.
+    - LicenseCatalog: Parses each license file once and caches it.
 
 Usage:
     Import the relevant classes to manage and apply license headers in your project.
 """
 from .license_arg_config import LicenseArgConfig
+from .license_catalog import LicenseCatalog
 from .license_generator import LicenseGenerator
-from .license_manager import LicenseManager
+from .license_manager import FileTypeClassifier, LicenseManager
+from .license_manifest import LicenseManifest
@@ -27,31 +27,393 @@ Usage:
     Call this function to automate license header management for project files.
 """
 import os
+import sys
+from collections import Counter
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+from src.file_list import open_file_list
+from src.file_walker import DEFAULT_PRUNE_DIRS, FileWalker
+from src.file_watcher import FileWatcher
+from src.git_files import list_git_files
+from src.ignore_matcher import IGNORE_FILE_NAMES
 from src.license_arg_config import LicenseArgConfig
 from src.license_generator import LicenseGenerator
-from src.license_manager import LicenseManager
+from src.license_manager import (
+    FileTypeClassifier,
+    LicenseKeywordMatcher,
+    LicenseManager,
+    LicenseResult,
+    LicenseStatus,
+)
+from src.license_journal import LicenseJournal
+from src.license_manifest import LicenseManifest
+from src.license_pipeline import prefetch
+from src.license_profiler import profile_call
+from src.license_rules import LicenseRules
+from src.license_server import LicenseServer
+from src.license_stats import LicenseStats
 
 
-def auto_license():
+def auto_license() -> int:
+    """
+    Run AutoLicense with the command-line configuration.
+    :return: The exit status, 1 if any file could not be processed or, with --check,
+        if any license is missing or out of date, 0 otherwise
+    """
     config = LicenseArgConfig()
     config.parse()
-    config.display_info()
+    if not config.serve:
+        # With --serve, the standard output only carries responses
+        config.display_info()
 
+    if config.profile:
+        return profile_call(config.profile, config.profile_output, run_auto_license, config)
+    return run_auto_license(config)
+
+
+class LicenseManagers(NamedTuple):
+    """
+    The LicenseManagers of a run: the default one, one per rule of the rules file,
+    and the manifest and statistics they share.
+    """
+
+    default: LicenseManager
+    rules: Optional[LicenseRules]
+    rule_managers: List[LicenseManager]
+    license_texts: List[str]
+    manifest: Optional[LicenseManifest]
+    stats: LicenseStats
+
+    def select(self, file_path: str) -> LicenseManager:
+        """Returns the manager of the rule matching the file, the default one if none does."""
+        index = self.rules.match(file_path) if self.rules is not None else None
+        return self.default if index is None else self.rule_managers[index]
+
+    def save_manifest(self):
+        """Save the manifest, if any."""
+        if self.manifest is not None:
+            self.manifest.save()
+
+
+def run_auto_license(config: LicenseArgConfig) -> int:
+    """
+    Run AutoLicense with a parsed configuration, see auto_license.
+    :param config: The parsed LicenseArgConfig
+    :return: The exit status
+    """
+    managers = build_managers(config)
+    if config.serve:
+        return run_serve(config, managers)
+
+    if config.check:
+        operation = LicenseManager.check_license
+    elif config.update_years:
+        operation = LicenseManager.update_years
+    else:
+        operation = LicenseManager.process_file
+
+    journal = None
+    if config.journal:
+        # Tied to the licenses and the operation: a journal of another run is started over
+        journal = LicenseJournal(
+            config.journal,
+            LicenseManifest.fingerprint(
+                "\n".join([operation.__name__] + managers.license_texts)
+            ),
+        )
+
+    def process(file_path: str):
+        """Apply the operation with the manager of the file, unless an interrupted run did."""
+        if journal is not None:
+            result = journal.result(file_path)
+            if result is not None:
+                return result
+        return operation(managers.select(file_path), file_path)
+
+    walker = build_walker(config, managers.default.classifier)
+    status_counts = Counter()
+    skip_counts = Counter()
+    if config.watch:
+        exit_status = run_watch(
+            config, managers, walker, process, journal, status_counts, skip_counts
+        )
+    else:
+        exit_status = run_pass(
+            managers,
+            select_file_paths(config, walker),
+            process,
+            config.jobs,
+            journal,
+            status_counts,
+            skip_counts,
+        )
+
+    print_summary(status_counts, skip_counts)
+    if config.stats_file:
+        managers.stats.write(config.stats_file)
+    return exit_status
+
+
+def build_managers(config: LicenseArgConfig) -> LicenseManagers:
+    """
+    Generate every license of the run once, up front, and create their managers,
+    sharing one manifest, classifier, keyword matcher and LicenseStats.
+    :param config: The parsed LicenseArgConfig
+    :return: The LicenseManagers of the run
+    """
     generator = LicenseGenerator(
         config.license_file,
         config.license_type,
         config.start_year,
         config.end_year,
         config.author,
+        config.catalog_cache,
+    )
+
+    rules = None
+    rule_generators = []
+    if config.rules:
+        rules = LicenseRules.load(config.rules, config.target_folder or os.curdir)
+        for rule in rules.rules:
+            rule_generators.append(
+                LicenseGenerator(
+                    config.license_file,
+                    rule.license_type or config.license_type,
+                    rule.start_year or config.start_year,
+                    rule.end_year or config.end_year,
+                    rule.author if rule.author is not None else config.author,
+                    config.catalog_cache,
+                )
+            )
+    license_texts = [
+        rule_generator.generate_license() for rule_generator in [generator] + rule_generators
+    ]
+
+    manifest = None
+    if config.manifest:
+        manifest = LicenseManifest(
+            config.manifest, LicenseManifest.fingerprint("\n".join(license_texts))
+        )
+
+    stats = LicenseStats()
+    classifier = FileTypeClassifier()
+    keyword_matcher = LicenseKeywordMatcher(
+        LicenseKeywordMatcher.default_keywords() + config.keywords
+    )
+    license_manager, *rule_managers = [
+        LicenseManager(
+            license_text,
+            config.detail,
+            manifest,
+            classifier=classifier,
+            keyword_matcher=keyword_matcher,
+            copyright_pattern=rule_generator.copyright_pattern(),
+            end_year=rule_generator.end_year,
+            max_file_size=config.max_size,
+            stats=stats,
+        )
+        for rule_generator, license_text in zip([generator] + rule_generators, license_texts)
+    ]
+    return LicenseManagers(license_manager, rules, rule_managers, license_texts, manifest, stats)
+
+
+def build_walker(config: LicenseArgConfig, classifier: FileTypeClassifier) -> FileWalker:
+    """
+    Create the FileWalker of the run, with its pruned folders, skipped extensions
+    and ignore files.
+    :param config: The parsed LicenseArgConfig
+    :param classifier: The FileTypeClassifier deciding which files are supported
+    :return: The FileWalker
+    """
+    prune_dirs = set(config.exclude_dirs)
+    if config.default_excludes:
+        prune_dirs |= DEFAULT_PRUNE_DIRS
+    return FileWalker(
+        classifier,
+        prune_dirs,
+        config.skip_extensions,
+        IGNORE_FILE_NAMES if config.ignore_files else (),
+    )
+
+
+def select_file_paths(config: LicenseArgConfig, walker: FileWalker) -> Iterator[str]:
+    """
+    Stream the files of the run: the listed files, the files changed in git, or
+    the files of the target folder.
+    :param config: The parsed LicenseArgConfig
+    :param walker: The FileWalker filtering or walking the files
+    :return: An iterator over the paths of the supported files
+    """
+    if config.paths or config.files_from is not None:
+        # The files are listed explicitly, stream them without walking anything
+        listed_paths = iter(config.paths)
+        if config.files_from is not None:
+            listed_paths = chain(listed_paths, open_file_list(config.files_from, config.null))
+        return (path for path in listed_paths if walker.accepts(path))
+    if config.since is not None or config.staged or config.tracked_only:
+        git_paths = list_git_files(
+            config.target_folder, config.since, config.staged, config.tracked_only
+        )
+        return (path for path in git_paths if walker.accepts(path))
+    return walker.walk(config.target_folder)
+
+
+def run_pass(
+    managers: LicenseManagers,
+    file_paths: Iterable[str],
+    process: Callable[[str], LicenseResult],
+    jobs: int,
+    journal: Optional[LicenseJournal],
+    status_counts: Counter,
+    skip_counts: Counter,
+    track: Optional[Callable] = None,
+) -> int:
+    """
+    Process a stream of files, report their results and save the manifest.
+    :param managers: The LicenseManagers of the run
+    :param file_paths: An iterable of paths, consumed lazily
+    :param process: Processes one file, with the manager and the operation of the run
+    :param jobs: The number of worker threads
+    :param journal: The journal of the run, removed once the pass completes, if any
+    :param status_counts: The number of files for each LicenseStatus, updated
+    :param skip_counts: The number of skipped files for each reason, updated
+    :param track: Wraps the results before they are reported, e.g. FileWatcher.track
+    :return: 1 if any file is missing its license, out of date or failed, 0 otherwise
+    """
+    # Discover the files ahead of processing them, through a bounded buffer,
+    # and process them through a bounded window: memory stays flat however
+    # many files there are
+    results = managers.default.process_many(
+        prefetch(managers.stats.timed(file_paths, "walk")), jobs, process
     )
-    license_text = generator.generate_license()
+    if track is not None:
+        results = track(results)
+    if journal is None:
+        exit_status = report_results(managers.default, results, status_counts, skip_counts)
+    else:
+        # Keep the journal if the run is interrupted, so that the next one resumes
+        try:
+            exit_status = report_results(
+                managers.default, journal.track(results), status_counts, skip_counts
+            )
+        finally:
+            journal.close()
+        journal.remove()
+    managers.save_manifest()
+    return exit_status
 
-    license_manager = LicenseManager(license_text, config.detail)
 
-    for root, files in os.walk(config.target_folder):
-        for file_name in files:
-            file_path = os.path.join(root, file_name)
-            license_manager.check_and_add_license(file_path)
+def run_watch(
+    config: LicenseArgConfig,
+    managers: LicenseManagers,
+    walker: FileWalker,
+    process: Callable[[str], LicenseResult],
+    journal: Optional[LicenseJournal],
+    status_counts: Counter,
+    skip_counts: Counter,
+) -> int:
+    """
+    Process the target folder, watching its folders as they are walked, then keep
+    the managers and their headers and only process the files written from now
+    on, until interrupted.
+    :param config: The parsed LicenseArgConfig
+    :param managers: The LicenseManagers of the run
+    :param walker: The FileWalker of the run
+    :param process: Processes one file, with the manager and the operation of the run
+    :param journal: The journal of the first pass, if any
+    :param status_counts: The number of files for each LicenseStatus, updated
+    :param skip_counts: The number of skipped files for each reason, updated
+    :return: 1 if any file is missing its license, out of date or failed, 0 otherwise
+    """
+    watcher = FileWatcher(walker)
+    exit_status = 0
+    try:
+        exit_status = run_pass(
+            managers,
+            watcher.walk(config.target_folder),
+            process,
+            config.jobs,
+            journal,
+            status_counts,
+            skip_counts,
+            watcher.track,
+        )
+        print(f"Watching {config.target_folder} for changes, press Ctrl+C to stop...")
+        for batch in watcher.batches():
+            results = watcher.track(managers.default.process_many(batch, config.jobs, process))
+            exit_status |= report_results(managers.default, results, status_counts, skip_counts)
+            managers.save_manifest()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return exit_status
+
+
+def run_serve(config: LicenseArgConfig, managers: LicenseManagers) -> int:
+    """
+    Answer JSON-RPC requests on the standard input, or on a Unix socket, until the
+    input ends or the server is interrupted.
+    :param config: The parsed LicenseArgConfig
+    :param managers: The LicenseManagers of the run
+    :return: The exit status, always 0
+    """
+    server = LicenseServer(managers.select)
+    try:
+        if config.socket:
+            server.serve_socket(config.socket)
+        else:
+            server.serve_stream(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    managers.save_manifest()
+    if config.stats_file:
+        managers.stats.write(config.stats_file)
+    return 0
+
+
+def report_results(
+    license_manager: LicenseManager, results, status_counts: Counter, skip_counts: Counter
+) -> int:
+    """
+    Report the results of a run and count them by status and skip reason.
+    :param license_manager: The LicenseManager logging the results
+    :param results: An iterable of LicenseResult
+    :param status_counts: The number of files for each LicenseStatus, updated
+    :param skip_counts: The number of skipped files for each reason, updated
+    :return: 1 if any file is missing its license, out of date or failed, 0 otherwise
+    """
+    exit_status = 0
+    for result in results:
+        license_manager.report(result)
+        status_counts[result.status] += 1
+        if result.status is LicenseStatus.SKIPPED:
+            skip_counts[result.reason] += 1
+        if result.status in (LicenseStatus.MISSING, LicenseStatus.STALE):
+            # Non-compliant files are always listed, for CI logs
+            print(result.path)
+            exit_status = 1
+        elif result.status is LicenseStatus.ERROR:
+            exit_status = 1
+    return exit_status
+
+
+def print_summary(status_counts: Counter, skip_counts: Counter):
+    """
+    Print how many files ended with each status, and why files were skipped.
+    :param status_counts: The number of files for each LicenseStatus
+    :param skip_counts: The number of skipped files for each reason
+    """
+    total = sum(status_counts.values())
+    counts = ", ".join(
+        f"{status_counts[status]} {status.label}" for status in LicenseStatus
+        if status_counts[status]
+    )
+    print(f"Summary: {total} files" + (f", {counts}" if counts else ""))
+    if skip_counts:
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(skip_counts.items()))
+        print(f"Skipped: {reasons}")
+
 
 if __name__ == "__main__":
-    auto_license()
+    raise SystemExit(auto_license())
@@ -0,0 +1,31 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+The single way the command-line modules stop a run on a fatal error.
+
+Errors raised while the files are discovered (reading a file list, asking git)
+happen in the prefetch thread, and reach the main thread as the SystemExit
+raised here, see license_pipeline.prefetch.
+"""
+import sys
+
+
+def handle_error(message: str):
+    """
+    Prints the error message and exits the program.
+    :param message: The error message to display
+    """
+    print(f"Error: {message}")
+    sys.exit(1)
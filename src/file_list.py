@@ -0,0 +1,74 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Reads explicit lists of files, one path per line or NUL-separated, as given by
+pre-commit frameworks, 'find -print0' or 'git ls-files -z'.
+
+The lists are read in chunks and the paths are yielded as they come, so a huge
+list is never held in memory.
+"""
+import os
+import sys
+from typing import BinaryIO, Iterator
+from src.error_handler import handle_error
+
+# Size of the chunks read from a list of files
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def split_stream(stream: BinaryIO, separator: bytes) -> Iterator[bytes]:
+    """
+    Yield the separated items of a binary stream as they are read
+    :param stream: The stream to read, up to its end
+    :param separator: The separator of the items, e.g. b"\\0" or b"\\n"
+    """
+    pending = b""
+    for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b""):
+        items = (pending + chunk).split(separator)
+        pending = items.pop()
+        yield from items
+    if pending:
+        yield pending
+
+
+def read_file_list(stream: BinaryIO, null_separated: bool = False) -> Iterator[str]:
+    """
+    Yield the paths of a list of files, skipping empty entries
+    :param stream: The binary stream holding the list
+    :param null_separated: Whether the paths are separated by NUL instead of newlines
+    """
+    separator = b"\0" if null_separated else b"\n"
+    for item in split_stream(stream, separator):
+        if not null_separated:
+            item = item.rstrip(b"\r")
+        if item:
+            yield os.fsdecode(item)
+
+
+def open_file_list(files_from: str, null_separated: bool = False) -> Iterator[str]:
+    """
+    Yield the paths of a list of files read from a file, or from the standard input
+    :param files_from: The path of the file holding the list, '-' for the standard input
+    :param null_separated: Whether the paths are separated by NUL instead of newlines
+    """
+    if files_from == "-":
+        yield from read_file_list(sys.stdin.buffer, null_separated)
+        return
+    try:
+        stream = open(files_from, "rb")
+    except OSError as e:
+        handle_error(f"Cannot read the list of files '{files_from}': {e.strerror or e}.")
+    with stream:
+        yield from read_file_list(stream, null_separated)
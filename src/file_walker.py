@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import os
+from typing import Callable, Iterable, Iterator, Optional
+from src.ignore_matcher import IGNORE_FILE_NAMES, IgnoreMatcher
+from src.license_manager import FileTypeClassifier
+
+# Folders that never hold project sources: version control data,
+# dependencies, virtual environments and build output
+DEFAULT_PRUNE_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "build",
+        "dist",
+        "venv",
+        ".venv",
+        "__pycache__",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+    }
+)
+
+
+class FileWalker:
+    """
+    Walks a folder with os.scandir and yields the files that can carry a license.
+
+    Folders listed in prune_dirs or ignored by the .gitignore and .licenseignore
+    files found along the way are never entered, and files are filtered by name
+    with the FileTypeClassifier, using only the type information returned by the
+    directory listing, so unsupported files cost no system call at all.
+    Symbolic links are not followed.
+    """
+
+    def __init__(
+        self,
+        classifier: Optional[FileTypeClassifier] = None,
+        prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+        skip_extensions: Iterable[str] = (),
+        ignore_file_names: Iterable[str] = IGNORE_FILE_NAMES,
+    ):
+        """
+        Initialize the FileWalker
+        :param classifier: The FileTypeClassifier to use, a default one if not provided
+        :param prune_dirs: Names of the folders that are not entered
+        :param skip_extensions: Extensions of supported files that are skipped anyway
+        :param ignore_file_names: Names of the ignore files honoured in every folder
+        """
+        self.classifier = classifier if classifier is not None else FileTypeClassifier()
+        self.prune_dirs = frozenset(prune_dirs)
+        self.skip_extensions = tuple(extension.lower() for extension in skip_extensions)
+        self.ignore_file_names = tuple(ignore_file_names)
+
+    def walk(
+        self,
+        target_folder: str,
+        on_folder: Optional[Callable[[str, IgnoreMatcher], None]] = None,
+        parent_matcher: Optional[IgnoreMatcher] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the paths of the supported files below the target folder, in sorted
+        order: the files of a folder first, then each of its sub-folders.
+        :param target_folder: The folder to walk
+        :param on_folder: Called with every folder entered and its IgnoreMatcher,
+            before its files are yielded
+        :param parent_matcher: The IgnoreMatcher of the parent of the target folder,
+            when only a sub-folder of a tree is walked
+        """
+        if parent_matcher is None:
+            parent_matcher = IgnoreMatcher(self.ignore_file_names)
+        stack = [(target_folder, parent_matcher)]
+        while stack:
+            folder, parent_matcher = stack.pop()
+            try:
+                with os.scandir(folder) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+
+            matcher = parent_matcher
+            if self.ignore_file_names:
+                matcher = parent_matcher.child(folder, (entry.name for entry in entries))
+            if on_folder is not None:
+                on_folder(folder, matcher)
+
+            sub_folders = []
+            for entry in entries:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir():
+                    if self.accepts_folder(entry.path, matcher):
+                        sub_folders.append((entry.path, matcher))
+                elif self.accepts(entry.name) and not matcher.is_ignored(entry.path, False):
+                    yield entry.path
+            stack.extend(reversed(sub_folders))
+
+    def accepts_folder(self, folder: str, matcher: IgnoreMatcher) -> bool:
+        """
+        Check if a folder is entered
+        :param folder: The path to the folder
+        :param matcher: The IgnoreMatcher of its parent folder
+        :return: True if the folder is neither pruned nor ignored, False otherwise
+        """
+        return os.path.basename(folder) not in self.prune_dirs and not matcher.is_ignored(
+            folder, True
+        )
+
+    def accepts(self, file_name: str) -> bool:
+        """
+        Check if a file is supported and not skipped by its extension
+        :param file_name: The name or path of the file
+        :return: True if the file should be processed, False otherwise
+        """
+        if self.skip_extensions and file_name.lower().endswith(self.skip_extensions):
+            return False
+        return self.classifier.classify(file_name) is not None
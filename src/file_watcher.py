@@ -0,0 +1,247 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Watches a tree with Linux inotify and reports the files written in it.
+
+The watches are added while the tree is walked for the initial pass, so the tree
+is never scanned again: only the folders created later are walked, once, when
+they appear.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.file_walker import FileWalker
+from src.ignore_matcher import IgnoreMatcher
+from src.license_manager import LicenseResult, LicenseStatus
+
+# inotify event masks, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# A file is processed once it is closed after writing or moved into place. A new
+# file is not processed when it is created, it is still being written.
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+
+# struct inotify_event without its variable-length name
+EVENT_HEADER = struct.Struct("iIII")
+
+# Size of the buffer events are read into
+READ_SIZE = 64 * 1024
+
+# A batch is processed once no event came for this many seconds...
+DEFAULT_DEBOUNCE = 0.2
+
+# ...or at the latest this many seconds after its first event
+MAX_BATCH_DELAY = 2.0
+
+
+class Inotify:
+    """A minimal binding of the Linux inotify API through ctypes."""
+
+    def __init__(self):
+        """Create an inotify instance, raises OSError where inotify is not available"""
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        try:
+            self._add_watch = libc.inotify_add_watch
+            init = libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify is not available on this system") from None
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Watch a folder
+        :param path: The path to the folder
+        :param mask: The events to report
+        :return: The watch descriptor
+        """
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """
+        Read the pending events without blocking
+        :return: The events as (watch descriptor, mask, name) tuples
+        """
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        """Close the inotify instance and all its watches"""
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """
+    Reports the supported files written below a folder, in batches: the events of
+    a file are coalesced, and a batch is only reported once the tree has been quiet
+    for the debounce delay.
+    """
+
+    def __init__(
+        self,
+        walker: FileWalker,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_delay: float = MAX_BATCH_DELAY,
+    ):
+        """
+        Initialize the FileWatcher
+        :param walker: The FileWalker deciding which folders and files are processed
+        :param debounce: How long, in seconds, the tree must be quiet before a batch is reported
+        :param max_delay: How long, in seconds, a batch may wait at most
+        """
+        self.walker = walker
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.inotify = Inotify()
+        self.folders: Dict[int, Tuple[str, IgnoreMatcher]] = {}
+        # (inode, mtime_ns, size) of the files we wrote, whose events are our own
+        self.own_writes: Dict[str, Tuple[int, int, int]] = {}
+
+    def walk(self, target_folder: str) -> Iterator[str]:
+        """
+        Walk the target folder for the initial pass, watching every folder entered
+        :param target_folder: The folder to walk and watch
+        """
+        return self.walker.walk(target_folder, self.add_folder)
+
+    def add_folder(self, folder: str, matcher: IgnoreMatcher):
+        """
+        Watch a folder
+        :param folder: The path to the folder
+        :param matcher: The IgnoreMatcher of the folder
+        """
+        try:
+            wd = self.inotify.add_watch(folder, WATCH_MASK)
+        except OSError as e:
+            print(f"[WARNING] Cannot watch {folder}: {e.strerror or e}")
+            return
+        self.folders[wd] = (folder, matcher)
+
+    def track(self, results: Iterable[LicenseResult]) -> Iterator[LicenseResult]:
+        """
+        Yield the results of processing files, remembering the files that were
+        modified, so that the events of our own writes do not process them again
+        :param results: An iterable of LicenseResult
+        """
+        for result in results:
+            if result.status in (LicenseStatus.ADDED, LicenseStatus.UPDATED):
+                stamp = self._stamp(result.path)
+                if stamp is not None:
+                    self.own_writes[result.path] = stamp
+            yield result
+
+    @staticmethod
+    def _stamp(file_path: str) -> Optional[Tuple[int, int, int]]:
+        """Returns the (inode, mtime_ns, size) of a file, or None if it is gone."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def batches(self) -> Iterator[List[str]]:
+        """Yield the paths of the files written since the last batch, forever."""
+        poller = select.poll()
+        poller.register(self.inotify.fd, select.POLLIN)
+        pending = {}
+        first_event = 0.0
+        while True:
+            timeout = None
+            if pending:
+                remaining = self.max_delay - (time.monotonic() - first_event)
+                timeout = max(min(self.debounce, remaining), 0) * 1000
+            if not poller.poll(timeout):
+                yield list(pending)
+                pending = {}
+                continue
+
+            if not pending:
+                first_event = time.monotonic()
+            for wd, mask, name in self.inotify.read_events():
+                self._handle_event(wd, mask, name, pending)
+            if pending and time.monotonic() - first_event >= self.max_delay:
+                yield list(pending)
+                pending = {}
+
+    def _handle_event(self, wd: int, mask: int, name: str, pending: dict):
+        """
+        Add the files of an event to the pending batch
+        :param wd: The watch descriptor of the folder
+        :param mask: The event mask
+        :param name: The name of the entry in the folder
+        :param pending: The paths of the pending batch, in order of first event
+        """
+        if mask & IN_Q_OVERFLOW:
+            print("[WARNING] Too many changes at once, some files were not processed.")
+            return
+        if mask & IN_IGNORED:
+            # The folder was removed
+            self.folders.pop(wd, None)
+            return
+        entry: Optional[Tuple[str, IgnoreMatcher]] = self.folders.get(wd)
+        if entry is None or not name:
+            return
+
+        folder, matcher = entry
+        path = os.path.join(folder, name)
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO) and self.walker.accepts_folder(path, matcher):
+                # Watch the new folder and take the files it already holds, only
+                # this folder is walked
+                for file_path in self.walker.walk(path, self.add_folder, matcher):
+                    pending[file_path] = None
+        elif (
+            mask & (IN_CLOSE_WRITE | IN_MOVED_TO)
+            and self.walker.accepts(name)
+            and not matcher.is_ignored(path, False)
+        ):
+            stamp = self.own_writes.pop(path, None)
+            if stamp is not None and stamp == self._stamp(path):
+                # Our own write, the file has not been touched since
+                return
+            pending[path] = None
+
+    def close(self):
+        """Stop watching"""
+        self.inotify.close()
+        self.folders.clear()
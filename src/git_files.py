@@ -0,0 +1,80 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Lists candidate files from git instead of walking the target folder.
+
+A single git command gives the files of the target folder that are changed since
+a reference, staged, or tracked, so that only those files are checked.
+"""
+import os
+import subprocess
+from typing import Iterator, List, Optional
+from src.error_handler import handle_error
+from src.file_list import split_stream
+
+
+def git_command(
+    since: Optional[str] = None, staged: bool = False, tracked_only: bool = False
+) -> List[str]:
+    """
+    Build the git command listing the candidate files, NUL-separated and relative
+    to the folder it runs in. Deleted files are left out.
+    :param since: A git reference, lists the files changed since it, committed or not
+    :param staged: Lists the files staged for the next commit
+    :param tracked_only: Lists every tracked file
+    :return: The command line
+    """
+    diff = ["git", "diff", "--name-only", "-z", "--diff-filter=ACMR", "--relative"]
+    if since is not None:
+        return diff + [since, "--"]
+    if staged:
+        return diff + ["--cached", "--"]
+    if tracked_only:
+        return ["git", "ls-files", "-z", "--"]
+    raise ValueError("One of since, staged or tracked_only must be given.")
+
+
+def list_git_files(
+    folder: str,
+    since: Optional[str] = None,
+    staged: bool = False,
+    tracked_only: bool = False,
+) -> Iterator[str]:
+    """
+    Yield the paths of the candidate files of a folder in a git working tree, as
+    listed by a single git command. The output is read as it comes, so huge lists
+    are never held in memory. Symbolic links are left out.
+    :param folder: The folder to list, inside a git working tree
+    :param since: A git reference, lists the files changed since it, committed or not
+    :param staged: Lists the files staged for the next commit
+    :param tracked_only: Lists every tracked file
+    """
+    command = git_command(since, staged, tracked_only)
+    try:
+        process = subprocess.Popen(
+            command, cwd=folder, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        handle_error("git is not installed or not in the PATH.")
+
+    with process:
+        for name in split_stream(process.stdout, b"\0"):
+            path = os.path.join(folder, os.fsdecode(name))
+            if not os.path.islink(path):
+                yield path
+        error = process.stderr.read().decode(errors="replace").strip()
+
+    if process.returncode != 0:
+        handle_error(f"'{' '.join(command)}' failed in '{folder}': {error}")
@@ -0,0 +1,230 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import os
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+# Ignore files read in every folder, later files take precedence
+IGNORE_FILE_NAMES = (".gitignore", ".licenseignore")
+
+
+class IgnoreRule(NamedTuple):
+    """A single pattern of an ignore file, translated to a regular expression."""
+
+    regex: str
+    negated: bool
+    dir_only: bool
+
+
+class IgnoreRules:
+    """
+    The rules of the ignore files of one folder, in the .gitignore format.
+
+    All the rules are compiled into a single regular expression, one group per
+    rule, in reverse order: the first group that matches is the last matching
+    rule of the file, which is the one that decides, as in git.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Parse and compile the rules
+        :param lines: The lines of the ignore files, in order
+        """
+        rules = [rule for rule in map(self.parse_rule, lines) if rule is not None]
+        self.file_regex, self.file_negated = self._compile(
+            [rule for rule in rules if not rule.dir_only]
+        )
+        self.dir_regex, self.dir_negated = self._compile(rules)
+
+    @classmethod
+    def from_files(cls, file_paths: Iterable[str]) -> "IgnoreRules":
+        """
+        Load the rules of one or more ignore files
+        :param file_paths: The paths to the ignore files, in order of precedence
+        """
+        lines = []
+        for file_path in file_paths:
+            try:
+                with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                    lines.extend(f.read().splitlines())
+            except OSError:
+                continue
+        return cls(lines)
+
+    @staticmethod
+    def _compile(rules: List[IgnoreRule]):
+        """Combine the rules into one regular expression, the last rule first."""
+        if not rules:
+            return None, ()
+        rules = rules[::-1]
+        regex = re.compile("|".join(f"({rule.regex})" for rule in rules), re.DOTALL)
+        return regex, tuple(rule.negated for rule in rules)
+
+    @classmethod
+    def parse_rule(cls, line: str) -> Optional[IgnoreRule]:
+        """
+        Parse one line of an ignore file
+        :param line: The line, without its newline
+        :return: The rule, or None for blank lines and comments
+        """
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            return None
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith(("\\#", "\\!")):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+
+        # A slash at the beginning or in the middle anchors the pattern to the
+        # folder of the ignore file, otherwise it matches at any depth
+        anchored = "/" in line
+        regex = cls.translate(line.lstrip("/"))
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        return IgnoreRule(regex, negated, dir_only)
+
+    @staticmethod
+    def translate(pattern: str) -> str:
+        """
+        Translate a glob pattern of the .gitignore format to a regular expression
+        without capturing groups.
+        :param pattern: The pattern, relative to the folder of the ignore file
+        :return: The regular expression
+        """
+        parts = []
+        i, n = 0, len(pattern)
+        while i < n:
+            c = pattern[i]
+            if c == "*":
+                whole_part = i == 0 or pattern[i - 1] == "/"
+                if pattern.startswith("**", i) and whole_part:
+                    if i + 2 == n:
+                        parts.append(".*")
+                        i += 2
+                        continue
+                    if pattern.startswith("/", i + 2):
+                        parts.append("(?:.*/)?")
+                        i += 3
+                        continue
+                parts.append("[^/]*")
+            elif c == "?":
+                parts.append("[^/]")
+            elif c == "[":
+                start = i + 1
+                if pattern[start:start + 1] in ("!", "^"):
+                    start += 1
+                if pattern[start:start + 1] == "]":
+                    start += 1
+                end = pattern.find("]", start)
+                if end == -1:
+                    parts.append(re.escape(c))
+                else:
+                    content = pattern[i + 1:end].replace("\\", "\\\\").replace("[", "\\[")
+                    if content[0] in ("!", "^"):
+                        content = "^" + content[1:]
+                    parts.append(f"[{content}]")
+                    i = end
+            elif c == "\\" and i + 1 < n:
+                i += 1
+                parts.append(re.escape(pattern[i]))
+            else:
+                parts.append(re.escape(c))
+            i += 1
+        return "".join(parts)
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Check a path against the rules
+        :param relative_path: The path relative to the folder of the ignore files, with '/'
+        :param is_dir: Whether the path is a folder
+        :return: True if ignored, False if explicitly re-included, None if no rule matches
+        """
+        if is_dir:
+            regex, negated = self.dir_regex, self.dir_negated
+        else:
+            regex, negated = self.file_regex, self.file_negated
+        if regex is None:
+            return None
+        match = regex.fullmatch(relative_path)
+        if match is None:
+            return None
+        return not negated[match.lastindex - 1]
+
+
+class IgnoreMatcher:
+    """
+    The ignore rules that apply inside one folder: its own rules and those of its
+    parent folders, the deepest rules taking precedence. A walker creates the
+    matcher of each sub-folder from the matcher of its parent as it descends, so
+    every ignore file is read and compiled once.
+    """
+
+    def __init__(
+        self,
+        ignore_file_names: Iterable[str] = IGNORE_FILE_NAMES,
+        folder: Optional[str] = None,
+        rules: Optional[IgnoreRules] = None,
+        parent: Optional["IgnoreMatcher"] = None,
+    ):
+        """
+        Initialize an IgnoreMatcher, the root one has no folder, rules or parent
+        :param ignore_file_names: The names of the ignore files read in every folder
+        :param folder: The folder the rules belong to
+        :param rules: The compiled rules of the folder
+        :param parent: The matcher of the closest parent folder with rules
+        """
+        self.ignore_file_names = tuple(ignore_file_names)
+        self.folder = os.path.join(folder, "") if folder is not None else None
+        self.rules = rules
+        self.parent = parent
+
+    def child(self, folder: str, file_names: Iterable[str]) -> "IgnoreMatcher":
+        """
+        Returns the matcher of a sub-folder
+        :param folder: The path to the sub-folder
+        :param file_names: The names of the entries of the sub-folder
+        :return: A new matcher if the sub-folder has ignore files, this one otherwise
+        """
+        names = set(file_names)
+        found = [name for name in self.ignore_file_names if name in names]
+        if not found:
+            return self
+        rules = IgnoreRules.from_files(os.path.join(folder, name) for name in found)
+        return IgnoreMatcher(self.ignore_file_names, folder, rules, self)
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Check if an entry of the folder is ignored
+        :param path: The path to the entry, starting with the path of a matched folder
+        :param is_dir: Whether the entry is a folder
+        :return: True if the entry is ignored, False otherwise
+        """
+        matcher = self
+        while matcher.rules is not None:
+            relative_path = path[len(matcher.folder):]
+            if os.sep != "/":
+                relative_path = relative_path.replace(os.sep, "/")
+            decision = matcher.rules.match(relative_path, is_dir)
+            if decision is not None:
+                return decision
+            matcher = matcher.parent
+        return False
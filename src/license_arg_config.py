@@ -15,6 +15,8 @@ import argparse
 import os
 import sys
 from datetime import datetime
+from src.license_manager import DEFAULT_MAX_FILE_SIZE
+from src.license_profiler import DEFAULT_PROFILE_OUTPUT, PROFILE_MODES
 
 class LicenseArgConfig:
     def __init__(self):
@@ -27,7 +29,32 @@ class LicenseArgConfig:
         self.end_year = None
         self.author = None
         self.target_folder = None
+        self.paths = []
+        self.files_from = None
+        self.null = False
         self.detail = False
+        self.jobs = 1
+        self.manifest = None
+        self.exclude_dirs = []
+        self.default_excludes = True
+        self.skip_extensions = []
+        self.ignore_files = True
+        self.since = None
+        self.staged = False
+        self.tracked_only = False
+        self.keywords = []
+        self.update_years = False
+        self.check = False
+        self.max_size = DEFAULT_MAX_FILE_SIZE
+        self.stats_file = None
+        self.profile = None
+        self.profile_output = DEFAULT_PROFILE_OUTPUT
+        self.catalog_cache = None
+        self.rules = None
+        self.watch = False
+        self.serve = False
+        self.socket = None
+        self.journal = None
 
     def parse(self):
         """
@@ -59,13 +86,31 @@ class LicenseArgConfig:
         # Required arguments
         parser.add_argument("--author", required=True, help="Author of the license")
 
-        # Target folder argument
+        # Target folder argument, required unless the files are listed explicitly
         parser.add_argument(
             "--target-folder",
-            required=True,
             help="Target folder containing files to which copyright will be applied",
         )
 
+        # Optional arguments: the files to process, instead of walking a folder
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            metavar="PATH",
+            help="Files to process, instead of walking the target folder",
+        )
+        parser.add_argument(
+            "--files-from",
+            metavar="FILE",
+            help="Read the files to process from FILE, one per line ('-' for the standard input)",
+        )
+        parser.add_argument(
+            "--null",
+            "-0",
+            action="store_true",
+            help="The list of --files-from is NUL-separated",
+        )
+
         # Optional argument
         parser.add_argument(
             "--detail",
@@ -73,6 +118,158 @@ class LicenseArgConfig:
             help="Show details on whether the license has been added to the files",
         )
 
+        # Optional argument
+        parser.add_argument(
+            "--jobs",
+            type=self._positive_int,
+            default=None,
+            help="Number of files processed in parallel (defaults to the CPU count)",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--manifest",
+            help="Path to a manifest file used to skip files unchanged since the last run",
+        )
+
+        # Optional arguments
+        parser.add_argument(
+            "--exclude-dir",
+            action="append",
+            default=[],
+            help="Name of a folder that is not entered (can be repeated)",
+        )
+        parser.add_argument(
+            "--no-default-excludes",
+            action="store_true",
+            help="Also enter version control, dependency and build folders",
+        )
+        parser.add_argument(
+            "--skip-ext",
+            action="append",
+            default=[],
+            help="Extension of files that are skipped (e.g., .js, can be repeated)",
+        )
+
+        parser.add_argument(
+            "--no-ignore-files",
+            action="store_true",
+            help="Do not honour the .gitignore and .licenseignore files",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--keyword",
+            action="append",
+            default=[],
+            help="Extra keyword marking an existing license header "
+            "(e.g., SPDX-License-Identifier, can be repeated)",
+        )
+
+        # Optional arguments, mutually exclusive: what is done to each file
+        mode_group = parser.add_mutually_exclusive_group()
+        mode_group.add_argument(
+            "--update-years",
+            action="store_true",
+            help="Only update the end year of existing copyright lines to the end year",
+        )
+        mode_group.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the files whose license is missing or out of date, "
+            "without changing any file",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--max-size",
+            type=self._non_negative_int,
+            default=DEFAULT_MAX_FILE_SIZE,
+            help="Files larger than this many bytes are skipped (0 for no limit)",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--stats",
+            dest="stats_file",
+            metavar="PATH",
+            help="Write the timings and counters of the run to a JSON file",
+        )
+
+        # Optional arguments
+        parser.add_argument(
+            "--profile",
+            choices=PROFILE_MODES,
+            help="Run under cProfile (cpu) or tracemalloc (mem)",
+        )
+        parser.add_argument(
+            "--profile-output",
+            default=DEFAULT_PROFILE_OUTPUT,
+            metavar="PATH",
+            help="Path of the .pstats file written by --profile=cpu",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--catalog-cache",
+            metavar="PATH",
+            help="Path to a cache of the parsed license file, reused while it is unchanged",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--rules",
+            metavar="FILE",
+            help="JSON file mapping path patterns to the license type, author and years to use",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="After the first pass, keep running and process the files written "
+            "in the target folder (Linux only)",
+        )
+
+        # Optional arguments
+        parser.add_argument(
+            "--serve",
+            action="store_true",
+            help="Keep running and answer JSON-RPC requests, one per line, on the "
+            "standard input or a Unix socket",
+        )
+        parser.add_argument(
+            "--socket",
+            metavar="PATH",
+            help="With --serve, listen on this Unix socket instead of the standard input",
+        )
+
+        # Optional argument
+        parser.add_argument(
+            "--journal",
+            metavar="PATH",
+            help="Journal of the completed files, so that an interrupted run resumes "
+            "where it stopped (removed once the run completes)",
+        )
+
+        # Optional arguments, mutually exclusive: take the files from git
+        git_group = parser.add_mutually_exclusive_group()
+        git_group.add_argument(
+            "--since",
+            metavar="REF",
+            help="Only process the files changed since a git reference (e.g., origin/main)",
+        )
+        git_group.add_argument(
+            "--staged",
+            action="store_true",
+            help="Only process the files staged in git",
+        )
+        git_group.add_argument(
+            "--tracked-only",
+            action="store_true",
+            help="Only process the files tracked by git",
+        )
+
         # Parse command-line arguments
         args = parser.parse_args()
 
@@ -90,6 +287,58 @@ class LicenseArgConfig:
         self.end_year = args.end_year
         # use an absolute path
         self.target_folder = args.target_folder
+        self.paths = args.paths
+        self.files_from = args.files_from
+        self.null = args.null
+        self.jobs = args.jobs if args.jobs is not None else (os.cpu_count() or 1)
+        self.manifest = args.manifest
+        self.exclude_dirs = args.exclude_dir
+        self.default_excludes = not args.no_default_excludes
+        self.skip_extensions = args.skip_ext
+        self.ignore_files = not args.no_ignore_files
+        self.since = args.since
+        self.staged = args.staged
+        self.tracked_only = args.tracked_only
+        self.keywords = args.keyword
+        self.update_years = args.update_years
+        self.check = args.check
+        self.max_size = args.max_size if args.max_size else None
+        self.stats_file = args.stats_file
+        self.profile = args.profile
+        self.profile_output = args.profile_output
+        self.catalog_cache = args.catalog_cache
+        self.rules = args.rules
+        self.watch = args.watch
+        self.serve = args.serve
+        self.socket = args.socket
+        self.journal = args.journal
+        if self.profile == "cpu":
+            # cProfile only sees the thread it runs in, so keep all the work there
+            self.jobs = 1
+
+    @staticmethod
+    def _positive_int(value: str) -> int:
+        """
+        Argparse type for options that need a positive integer.
+        :param value: The raw command-line value
+        :return: The value as an integer
+        """
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"{value} must be a positive integer")
+        return number
+
+    @staticmethod
+    def _non_negative_int(value: str) -> int:
+        """
+        Argparse type for options that need a positive integer or zero.
+        :param value: The raw command-line value
+        :return: The value as an integer
+        """
+        number = int(value)
+        if number < 0:
+            raise argparse.ArgumentTypeError(f"{value} must be zero or a positive integer")
+        return number
 
     def _validate_args(self, args):
         """
@@ -114,6 +363,38 @@ class LicenseArgConfig:
                     args.end_year} cannot be in the future. Current year is {current_year}."
             )
 
+        # Watching needs inotify and a walk of the target folder
+        if args.watch:
+            if not sys.platform.startswith("linux"):
+                self._handle_error("--watch is only supported on Linux.")
+            if args.since is not None or args.staged or args.tracked_only:
+                self._handle_error(
+                    "--watch cannot be combined with --since, --staged or --tracked-only."
+                )
+            if args.paths or args.files_from is not None:
+                self._handle_error("--watch cannot be combined with a list of files.")
+
+        # A socket is only used to serve requests
+        if args.socket is not None and not args.serve:
+            self._handle_error("--socket can only be used with --serve.")
+        if args.serve and args.watch:
+            self._handle_error("--serve cannot be combined with --watch.")
+        if args.journal is not None and args.serve:
+            self._handle_error("--journal cannot be combined with --serve.")
+
+        # Check if the rules file exists
+        if args.rules is not None and not os.path.isfile(args.rules):
+            self._handle_error(f"Rules file '{args.rules}' does not exist.")
+
+        # Without a target folder, the files must be listed explicitly, and
+        # nothing can be walked
+        if args.target_folder is None:
+            if not args.paths and args.files_from is None and not args.serve:
+                self._handle_error("A target folder or a list of files must be given.")
+            if args.since is not None or args.staged or args.tracked_only:
+                self._handle_error("--since, --staged and --tracked-only need a target folder.")
+            return
+
         # Check if target folder exists
         if not os.path.isdir(args.target_folder):
             self._handle_error(
@@ -121,8 +402,8 @@ class LicenseArgConfig:
                     args.target_folder}' does not exist."
             )
 
-        # Check if the target folder is writable
-        if not os.access(args.target_folder, os.W_OK):
+        # Check if the target folder is writable, unless it is only checked
+        if not args.check and not os.access(args.target_folder, os.W_OK):
             self._handle_error(
                 f"Target folder '{
                     args.target_folder}' is not writable. Please ensure you have write permissions."
@@ -143,8 +424,10 @@ class LicenseArgConfig:
         print(f"Start year: {self.start_year}")
         print(f"End year: {self.end_year if self.end_year else 'N/A'}")
         print(f"Author: {self.author}")
-        print(f"Target folder: {self.target_folder}")
+        print(f"Target folder: {self.target_folder if self.target_folder else 'N/A'}")
         print(f"Show details: {self.detail}")
+        print(f"Jobs: {self.jobs}")
+        print(f"Manifest: {self.manifest if self.manifest else 'N/A'}")
 
 def main():
     # Create LicenseArgConfig instance
@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import json
+import os
+import threading
+from typing import Optional
+
+
+class LicenseCatalog:
+    """
+    The licenses defined in a license.json file, by license type.
+
+    Each file is parsed at most once per process: the catalogs are cached by absolute
+    path and checked against the (mtime_ns, size) of the file, so creating many
+    LicenseGenerators costs a stat call and a dict lookup. A compact on-disk cache
+    can also be given, which the next processes read back instead of the license
+    file. It only holds plain JSON data, so a tampered cache can never run code.
+    """
+
+    VERSION = 1
+
+    _catalogs = {}
+    _lock = threading.Lock()
+
+    def __init__(self, licenses: dict):
+        """
+        Initialize the LicenseCatalog
+        :param licenses: The license data by license type, the "licenses" object of the file
+        """
+        self.licenses = licenses
+
+    def get(self, license_type: str) -> Optional[dict]:
+        """
+        Returns the data of one license type
+        :param license_type: The type of the license (e.g., 'MIT License')
+        :return: The license data, or None if the type is not in the catalog
+        """
+        return self.licenses.get(license_type)
+
+    @classmethod
+    def load(cls, license_file: str, cache_file: Optional[str] = None) -> "LicenseCatalog":
+        """
+        Returns the catalog of a license file, parsing it only if it changed since it
+        was last parsed by this process or, with a cache file, by any process.
+        :param license_file: The path to the license.json file
+        :param cache_file: The path to an optional on-disk cache
+        :return: The LicenseCatalog
+        :raises FileNotFoundError: If the license file does not exist
+        :raises json.JSONDecodeError: If the license file is not valid JSON
+        """
+        key = os.path.abspath(license_file)
+        try:
+            stat = os.stat(license_file)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            # Nothing to check a cached copy against, always parse
+            stamp = None
+
+        catalog = None
+        if stamp is not None:
+            with cls._lock:
+                cached = cls._catalogs.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            if cache_file:
+                catalog = cls._load_cache(cache_file, key, stamp)
+
+        if catalog is None:
+            catalog = cls.parse(license_file)
+            if stamp is not None and cache_file:
+                cls._save_cache(cache_file, key, stamp, catalog)
+
+        if stamp is not None:
+            with cls._lock:
+                cls._catalogs[key] = (stamp, catalog)
+        return catalog
+
+    @classmethod
+    def parse(cls, license_file: str) -> "LicenseCatalog":
+        """
+        Parse a license file without any caching
+        :param license_file: The path to the license.json file
+        :return: The LicenseCatalog
+        """
+        with open(license_file, "r") as f:
+            data = json.load(f)
+        return cls(data["licenses"])
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget the catalogs parsed by this process."""
+        with cls._lock:
+            cls._catalogs.clear()
+
+    @classmethod
+    def _load_cache(cls, cache_file: str, key: str, stamp: list) -> Optional["LicenseCatalog"]:
+        """Load the catalog from the on-disk cache, or None if it is missing or stale"""
+        try:
+            with open(cache_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != cls.VERSION
+            or data.get("source") != key
+            or data.get("stamp") != stamp
+            or not isinstance(data.get("licenses"), dict)
+        ):
+            return None
+        return cls(data["licenses"])
+
+    @classmethod
+    def _save_cache(cls, cache_file: str, key: str, stamp: list, catalog: "LicenseCatalog"):
+        """Write the catalog to the on-disk cache, replacing the previous one atomically"""
+        temp_file = f"{cache_file}.tmp"
+        data = {
+            "version": cls.VERSION,
+            "source": key,
+            "stamp": stamp,
+            "licenses": catalog.licenses,
+        }
+        try:
+            with open(temp_file, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # The cache is only an optimization, a run must not fail because of it
+            pass
@@ -12,9 +12,11 @@
 # and this permission notice
 # shall be included in all copies or substantial portions of the Software.
 import json
+import re
 import sys
 from datetime import datetime
 from typing import Optional
+from src.license_catalog import LicenseCatalog
 
 class LicenseGenerator:
     def __init__(
@@ -24,6 +26,7 @@ class LicenseGenerator:
         start_year: int,
         end_year: Optional[int] = None,
         author: Optional[str] = None,
+        catalog_cache: Optional[str] = None,
     ):
         """
         Initialize LicenseGenerator and load the license file contents.
@@ -32,6 +35,7 @@ class LicenseGenerator:
         :param start_year: The start year of the license
         :param end_year: The end year of the license (if not provided, defaults to the current year)
         :param author: The author of the license
+        :param catalog_cache: The path to an optional on-disk cache of the parsed license file
         """
         if not license_type:
             self._handle_error("License type must be specified.")
@@ -57,6 +61,7 @@ class LicenseGenerator:
         self.start_year = start_year
         self.end_year = end_year
         self.author = author
+        self.catalog_cache = catalog_cache
         self.license_data = self._load_license_data()
 
     def _handle_error(self, message: str):
@@ -65,16 +70,16 @@ class LicenseGenerator:
         sys.exit(1)
 
     def _load_license_data(self):
-        """Load the license data from the JSON file"""
+        """Load the license data from the JSON file, parsed once per process"""
         try:
-            with open(self.license_file, "r") as f:
-                data = json.load(f)
-                if self.license_type not in data["licenses"]:
-                    self._handle_error(
-                        f"License type '{
-                            self.license_type}' not found in the license file."
-                    )
-                return data["licenses"][self.license_type]
+            catalog = LicenseCatalog.load(self.license_file, self.catalog_cache)
+            license_data = catalog.get(self.license_type)
+            if license_data is None:
+                self._handle_error(
+                    f"License type '{
+                        self.license_type}' not found in the license file."
+                )
+            return license_data
         except FileNotFoundError:
             self._handle_error(
                 f"License file '{
@@ -102,6 +107,27 @@ class LicenseGenerator:
             self.license_type}\n\n{copyright_text}\n\n{permissions_text}\n\n{conditions_text}"
         return license_text
 
+    def copyright_pattern(self) -> "re.Pattern[bytes]":
+        """
+        Build a regular expression matching the copyright line of this license, as
+        written by generate_license, for any year range. The years are captured in
+        the 'start_year' and 'end_year' groups.
+        :return: The compiled pattern, matching bytes
+        """
+        template = " ".join(self.license_data["copyright"])
+        regex = []
+        seen = set()
+        for part in re.split(r"(\{start_year\}|\{end_year\}|\{author\})", template):
+            if part in ("{start_year}", "{end_year}"):
+                name = part[1:-1]
+                regex.append(f"(?P={name})" if name in seen else rf"(?P<{name}>\d{{4}})")
+                seen.add(name)
+            elif part == "{author}":
+                regex.append(re.escape(self.author))
+            else:
+                regex.append(re.escape(part))
+        return re.compile("".join(regex).encode("utf-8"))
+
 # Main section where LicenseGenerator is used
 if __name__ == "__main__":
     license_generator_mit = LicenseGenerator(
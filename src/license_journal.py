@@ -0,0 +1,177 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+import json
+import os
+import time
+from typing import Iterable, Iterator, Optional
+from src.license_manager import LicenseResult, LicenseStatus
+
+# Number of entries, and seconds, after which the journal is synced to disk
+JOURNAL_SYNC_ENTRIES = 1000
+JOURNAL_SYNC_INTERVAL = 1.0
+
+STATUSES = {status.label: status for status in LicenseStatus}
+
+
+class LicenseJournal:
+    """
+    Append-only, crash-safe record of the files completed by a run, so that an
+    interrupted run resumes where it stopped instead of starting over.
+
+    The journal is a file of JSON lines: a header tying it to the license
+    configuration and the operation of the run, then one [path, status, reason] line
+    per completed file. Lines are appended as the files complete and synced to disk
+    in batches, so a crash loses at most the last batch, whose files are simply
+    processed again. A torn last line is dropped when the journal is loaded.
+    Failed files are not recorded, so that they are retried.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        journal_file: str,
+        config_hash: str,
+        sync_entries: int = JOURNAL_SYNC_ENTRIES,
+        sync_interval: float = JOURNAL_SYNC_INTERVAL,
+    ):
+        """
+        Initialize the LicenseJournal, load the entries of an interrupted run and
+        open the journal for appending
+        :param journal_file: The path to the journal file
+        :param config_hash: The fingerprint of the license configuration and operation of this run
+        :param sync_entries: The number of entries after which the journal is synced
+        :param sync_interval: The number of seconds after which the journal is synced
+        """
+        self.journal_file = journal_file
+        self.config_hash = config_hash
+        self.sync_entries = sync_entries
+        self.sync_interval = sync_interval
+        self.entries = {}
+        self._file = self._open()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        """
+        Load the entries of the journal file and open it for appending. A journal of
+        another configuration is started over, and a torn last line is truncated.
+        """
+        valid_size = 0
+        try:
+            with open(self.journal_file, "rb") as f:
+                header = f.readline()
+                if header.endswith(b"\n") and self._parse(header) == {
+                    "version": self.VERSION,
+                    "config": self.config_hash,
+                }:
+                    valid_size = f.tell()
+                    for line in f:
+                        entry = self._parse(line) if line.endswith(b"\n") else None
+                        if not isinstance(entry, list) or len(entry) != 3:
+                            break
+                        path, label, reason = entry
+                        if label not in STATUSES:
+                            break
+                        self.entries[path] = (STATUSES[label], reason)
+                        valid_size += len(line)
+        except FileNotFoundError:
+            pass
+
+        if valid_size == 0:
+            journal = open(self.journal_file, "wb")
+            header = {"version": self.VERSION, "config": self.config_hash}
+            journal.write(json.dumps(header).encode("utf-8") + b"\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+            return journal
+        journal = open(self.journal_file, "r+b")
+        journal.truncate(valid_size)
+        journal.seek(valid_size)
+        return journal
+
+    @staticmethod
+    def _parse(line: bytes):
+        """Decode a JSON line, None if it is corrupt"""
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def result(self, file_path: str) -> Optional[LicenseResult]:
+        """
+        Get the result journaled for a file by an interrupted run
+        :param file_path: The path to the file
+        :return: The journaled result, None if the file still has to be processed
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return None
+        status, reason = entry
+        return LicenseResult(
+            file_path, status, f"{file_path}: {status.label} in an interrupted run", reason
+        )
+
+    def record(self, result: LicenseResult):
+        """
+        Append the result of a completed file to the journal, and sync the journal
+        when the batch is full. Failed files are not recorded.
+        :param result: The result of the file
+        """
+        if result.status is LicenseStatus.ERROR or result.path in self.entries:
+            return
+        line = json.dumps([result.path, result.status.label, result.reason])
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._pending += 1
+        if (
+            self._pending >= self.sync_entries
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def track(self, results: Iterable[LicenseResult]) -> Iterator[LicenseResult]:
+        """
+        Record every result of a run as it completes, and sync the journal if the
+        run stops, whether it ends or is interrupted.
+        :param results: An iterable of LicenseResult
+        """
+        try:
+            for result in results:
+                self.record(result)
+                yield result
+        finally:
+            self.sync()
+
+    def sync(self):
+        """Write the pending entries to disk"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the journal, keeping it for the next run"""
+        self.sync()
+        self._file.close()
+
+    def remove(self):
+        """Close and delete the journal, and forget its entries, once the run is complete"""
+        self._file.close()
+        self.entries = {}
+        try:
+            os.remove(self.journal_file)
+        except FileNotFoundError:
+            pass
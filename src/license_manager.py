@@ -12,10 +12,64 @@
 # The above copyright notice
 # and this permission notice
 # shall be included in all copies or substantial portions of the Software.
+import codecs
+import errno
+import io
+import mmap
 import os
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
 from src.license_generator import LicenseGenerator
+from src.license_manifest import LicenseManifest
+from src.license_pipeline import ordered_map
+from src.license_stats import LicenseStats
+
+# Detection only looks at the beginning of a file: at most this many lines,
+# and at most this many characters in total, however long the lines are
+MAX_HEADER_LINES = 30
+MAX_HEADER_SIZE = 64 * 1024
+
+# Files are classified as binary or generated from this many first bytes
+SNIFF_SIZE = 8 * 1024
+
+# Files larger than this are skipped by default
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# Markers of generated files, which must not be edited by hand. They are only
+# looked for in the comments at the very beginning of a file, not in its code
+GENERATED_MARKERS = re.compile(
+    rb"@generated|do not edit|code generated by|auto-?generated", re.IGNORECASE
+)
+
+# Beginnings of the comment lines (and of the XML declarations and doctypes) that
+# may come before the first line of code, and the block comments they may open
+LEADING_COMMENT_PREFIXES = (b"#", b"//", b"/*", b"*", b"<!", b"<?", b"--", b";", b"%")
+BLOCK_COMMENTS = ((b"/*", b"*/"), (b"<!--", b"-->"))
+
+# Size of the chunks used to copy the body of a file behind a new header
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Errors meaning that the kernel cannot copy between two files by itself
+UNSUPPORTED_COPY_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP)
+
+# Byte order marks recognized at the beginning of a file, with their encoding
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Encodings and newlines the headers are pre-encoded in
+HEADER_ENCODINGS = ("utf-8", "utf-16-le", "utf-16-be")
+NEWLINES = ("\n", "\r\n")
 
 class CommentStyle(Enum):
     """Enum to map file extensions to their respective comment styles."""
@@ -25,7 +79,11 @@ class CommentStyle(Enum):
     XML_HTML = "<!-- "  # For HTML/XML comments (start with <!--, end with -->)
 
 class FileType(Enum):
-    """Enum to map file extensions to their respective comment styles."""
+    """
+    Enum to map file extensions to their respective comment styles.
+    An extension may have several parts (e.g. '.d.ts'). A value without a leading
+    dot is an exact file name (e.g. 'Makefile'). All of them match case-insensitively.
+    """
 
     PYTHON = (".py", CommentStyle.SINGLE_LINE)
     SHELL = (".sh", CommentStyle.SINGLE_LINE)
@@ -37,11 +95,16 @@ class FileType(Enum):
     R = (".r", CommentStyle.SINGLE_LINE)
     TOML = (".toml", CommentStyle.SINGLE_LINE)
     YAML = (".yml", CommentStyle.SINGLE_LINE)
+    YAML_LONG = (".yaml", CommentStyle.SINGLE_LINE)
+    MAKEFILE = ("Makefile", CommentStyle.SINGLE_LINE)
+    DOCKERFILE = ("Dockerfile", CommentStyle.SINGLE_LINE)
     JAVA = (".java", CommentStyle.MULTI_LINE)
     CPP = (".cpp", CommentStyle.MULTI_LINE)
     C = (".c", CommentStyle.MULTI_LINE)
     HEADER = (".h", CommentStyle.MULTI_LINE)
     JAVASCRIPT = (".js", CommentStyle.MULTI_LINE)
+    TYPESCRIPT = (".ts", CommentStyle.MULTI_LINE)
+    TYPESCRIPT_DECLARATION = (".d.ts", CommentStyle.MULTI_LINE)
     CSS = (".css", CommentStyle.MULTI_LINE)
     HTML = (".html", CommentStyle.XML_HTML)
     XML = (".xml", CommentStyle.XML_HTML)
@@ -52,74 +115,815 @@ class FileType(Enum):
         self.comment_style = comment_style
 
 
+class FileTypeClassifier:
+    """
+    Index of the FileType members, built once, to classify file paths without
+    scanning the enum: exact file names are looked up first, then the suffixes of
+    the file name from the longest to the shortest.
+    """
+
+    def __init__(self, file_types=FileType):
+        """
+        Build the lookup tables
+        :param file_types: The FileType members to index
+        """
+        self.file_names = {}
+        self.extensions = {}
+        self.multi_suffixes = {}
+        for file_type in file_types:
+            key = file_type.extension.lower()
+            if not key.startswith("."):
+                self.file_names.setdefault(key, file_type)
+            elif key.count(".") > 1:
+                self.multi_suffixes.setdefault(key, file_type)
+            else:
+                self.extensions.setdefault(key, file_type)
+        self.max_suffix_parts = max(
+            [suffix.count(".") for suffix in self.multi_suffixes], default=1
+        )
+
+    def classify(self, file_path: str) -> Optional[FileType]:
+        """
+        Returns the FileType of a file from its name, or None if it is not supported.
+        :param file_path: The path to the file
+        """
+        name = os.path.basename(file_path).lower()
+        file_type = self.file_names.get(name)
+        if file_type is not None:
+            return file_type
+
+        # Collect the suffixes from the shortest ('.ts') to the longest ('.d.ts').
+        # A leading dot starts a hidden file name, not an extension.
+        end = len(name)
+        suffixes = []
+        for _ in range(self.max_suffix_parts):
+            end = name.rfind(".", 0, end)
+            if end <= 0:
+                break
+            suffixes.append(name[end:])
+
+        for suffix in reversed(suffixes[1:]):
+            file_type = self.multi_suffixes.get(suffix)
+            if file_type is not None:
+                return file_type
+        return self.extensions.get(suffixes[0]) if suffixes else None
+
+    def classify_extension(self, file_extension: str) -> Optional[FileType]:
+        """
+        Returns the FileType of a single file extension, or None if it is not supported.
+        :param file_extension: The extension, including its leading dot (e.g. '.py')
+        """
+        return self.extensions.get(file_extension.lower())
+
+
 class LicenseKeyword(Enum):
     """Enum to store common keywords in license text"""
 
     COPYRIGHT = "Copyright"
     LICENSE = "License"
-    YEAR = str(datetime.now().year)  # Get the current year dynamically
+
+
+class LicenseKeywordMatcher:
+    """
+    Finds license-related keywords in a text with a single pre-compiled regular
+    expression, so that the text is scanned once whatever the number of keywords.
+    """
+
+    def __init__(self, keywords: Optional[Iterable[str]] = None):
+        """
+        Compile the keywords
+        :param keywords: The keywords to look for, the default ones if not provided
+        """
+        if keywords is None:
+            keywords = self.default_keywords()
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self.regex = None
+        if self.keywords:
+            self.regex = re.compile("|".join(map(re.escape, self.keywords)))
+
+    @staticmethod
+    def default_keywords() -> List[str]:
+        """Returns the LicenseKeyword values and the current year, taken at call time"""
+        return [keyword.value for keyword in LicenseKeyword] + [str(datetime.now().year)]
+
+    def search(self, text: str) -> bool:
+        """
+        Check if the text contains any of the keywords
+        :param text: The text to scan
+        :return: True if a keyword is found, False otherwise
+        """
+        return self.regex is not None and self.regex.search(text) is not None
+
+class LicenseStatus(Enum):
+    """Enum to describe the outcome of processing a single file, with its log level."""
+
+    ADDED = ("added", "INFO")
+    UPDATED = ("updated", "INFO")
+    MISSING = ("missing", "WARNING")
+    STALE = ("stale", "WARNING")
+    PRESENT = ("present", "INFO")
+    SKIPPED = ("skipped", "WARNING")
+    ERROR = ("error", "ERROR")
+
+    def __init__(self, label, level):
+        self.label = label
+        self.level = level
+
+
+class LicenseResult(NamedTuple):
+    """
+    The result of processing a single file: what happened to it, why it was skipped,
+    the bytes read from and written to it, and the time it took in seconds.
+    """
+
+    path: str
+    status: LicenseStatus
+    message: str
+    reason: str = ""
+    bytes_read: int = 0
+    bytes_written: int = 0
+    duration: float = 0.0
+
+
+class TextLayout(NamedTuple):
+    """
+    How the text of a file is stored: its byte order mark, its encoding and its
+    newline, as detected from its first bytes. Files without a BOM are taken as
+    UTF-8, or any ASCII-compatible encoding, and are never decoded.
+    """
+
+    bom: bytes = b""
+    encoding: str = "utf-8"
+    newline: str = "\n"
+
+    @classmethod
+    def detect(cls, prefix: bytes) -> "TextLayout":
+        """
+        Detect the layout of a file
+        :param prefix: The first bytes of the file
+        :return: The TextLayout, the newline is the one ending the first line
+        """
+        for bom, encoding in BOMS:
+            if prefix.startswith(bom):
+                break
+        else:
+            bom, encoding = b"", "utf-8"
+        text = cls(bom, encoding).decode_prefix(prefix)
+        end = text.find(b"\n")
+        newline = "\r\n" if end > 0 and text[end - 1:end] == b"\r" else "\n"
+        return cls(bom, encoding, newline)
+
+    def decode_prefix(self, prefix: bytes) -> bytes:
+        """
+        Returns the first bytes of a file after the BOM as UTF-8, so that they can be
+        scanned like any other file. Files without a BOM or in UTF-8 are not decoded.
+        :param prefix: The first bytes of the file
+        """
+        body = prefix[len(self.bom):]
+        if self.encoding == "utf-8":
+            return body
+        # Drop a code unit cut in half by the end of the prefix
+        body = body[:len(body) - len(body) % 2]
+        return body.decode(self.encoding, errors="replace").encode("utf-8")
+
+    def file_offset(self, text: bytes, offset: int) -> int:
+        """
+        Returns the offset in the file of an offset in the result of decode_prefix
+        :param text: The result of decode_prefix
+        :param offset: The offset in text, at a character boundary
+        """
+        if self.encoding == "utf-8":
+            return len(self.bom) + offset
+        return len(self.bom) + len(
+            text[:offset].decode("utf-8", errors="replace").encode(self.encoding)
+        )
+
 
 class LicenseManager:
-    def __init__(self, license_text: str, detail: bool = False):
+    # Locks of the files being changed, by real path, shared by all the managers so
+    # that a file listed twice, or through a link, is never changed twice at once
+    _file_locks = {}
+    _file_locks_lock = threading.Lock()
+
+    def __init__(
+        self,
+        license_text: str,
+        detail: bool = False,
+        manifest: Optional[LicenseManifest] = None,
+        classifier: Optional[FileTypeClassifier] = None,
+        keyword_matcher: Optional[LicenseKeywordMatcher] = None,
+        copyright_pattern: Optional["re.Pattern[bytes]"] = None,
+        end_year: Optional[int] = None,
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        stats: Optional[LicenseStats] = None,
+    ):
         """
         Initialize the LicenseManager instance
         :param license_text: The license text to be added to the file
         :param detail: A flag to control whether detailed logs should be printed
+        :param manifest: An optional manifest used to skip files unchanged since the last run
+        :param classifier: The FileTypeClassifier to use, a default one if not provided
+        :param keyword_matcher: The LicenseKeywordMatcher used to recognize an existing
+            license, a default one if not provided
+        :param copyright_pattern: The pattern of the copyright line, from
+            LicenseGenerator.copyright_pattern, needed to update the years
+        :param end_year: The end year written by update_years
+        :param max_file_size: Files larger than this many bytes are skipped, None for no limit
+        :param stats: The LicenseStats collecting timers and counters, a new one if not provided
         """
         self.license_text = license_text
         self.detail = detail
+        self.manifest = manifest
+        self.classifier = classifier if classifier is not None else FileTypeClassifier()
+        self.keyword_matcher = (
+            keyword_matcher if keyword_matcher is not None else LicenseKeywordMatcher()
+        )
+        self.copyright_pattern = copyright_pattern
+        self.end_year = end_year
+        self.max_file_size = max_file_size
+        self.stats = stats if stats is not None else LicenseStats()
+
+        # Render the header of every comment style once, as the exact bytes
+        # written in front of a file in each encoding and newline, so that the
+        # per-file work is only I/O
+        self.headers = {}
+        self.header_variants = {}
+        self.header_fingerprints = {}
+        # Files recorded by a run that also compared the end year, which a run
+        # only checking for the license must not vouch for
+        self.years_fingerprints = {}
+        with self.stats.phase("format"):
+            for comment_style in CommentStyle:
+                header = self.format_license_with_comments(comment_style.value) + "\n"
+                for encoding in HEADER_ENCODINGS:
+                    for newline in NEWLINES:
+                        self.header_variants[(comment_style, encoding, newline)] = header.replace(
+                            "\n", newline
+                        ).encode(encoding)
+                self.headers[comment_style] = self.header_variants[
+                    (comment_style, "utf-8", "\n")
+                ]
+                self.header_fingerprints[comment_style] = LicenseManifest.fingerprint(header)
+                self.years_fingerprints[comment_style] = LicenseManifest.fingerprint(
+                    f"{header}\nend year: {self.end_year}"
+                )
+        self.max_header_size = max(map(len, self.header_variants.values()))
 
-    def check_and_add_license(self, file_path: str):
+    def check_and_add_license(self, file_path: str) -> LicenseStatus:
         """
         Check if the file extension is supported, then check if it already contains a license. 
         If not, add the license.
         :param file_path: The path to the file where the license should be added
+        :return: The status describing what happened to the file
         """
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            self.print_log(f"The file {file_path} does not exist.", level="ERROR")
-            return
+        result = self.process_file(file_path)
+        self.report(result)
+        return result.status
 
-        # Check if the file extension is valid (matches one of the defined file
-        # types)
-        file_extension = os.path.splitext(file_path)[1]
-        file_type = self.get_file_type(file_extension)
+    def process_file(self, file_path: str) -> LicenseResult:
+        """
+        Same as check_and_add_license, but returns the result instead of logging it,
+        so that it can be called from worker threads and reported later in a fixed order.
+        :param file_path: The path to the file where the license should be added
+        :return: The result of processing the file
+        """
+        return self._run(self._process_file, file_path, exclusive=True)
+
+    def process_many(
+        self,
+        file_paths: Iterable[str],
+        jobs: int = 1,
+        operation: Optional[Callable[[str], LicenseResult]] = None,
+    ) -> Iterator[LicenseResult]:
+        """
+        Process a batch of files, yielding one LicenseResult per path in the order of
+        the paths. Nothing is printed, and the rendered headers, the classifier and the
+        keyword matcher are shared by the whole batch. The paths are consumed lazily,
+        so the batch can be any iterable, however large.
+        :param file_paths: An iterable of paths
+        :param jobs: The number of worker threads, 1 processes the files in the calling thread
+        :param operation: The method applied to each path, process_file by default,
+            or check_license or update_years
+        :return: An iterator over the results
+        """
+        return ordered_map(
+            operation if operation is not None else self.process_file, file_paths, jobs
+        )
+
+    def update_years(self, file_path: str) -> LicenseResult:
+        """
+        Update the end year of the copyright line of the license header to self.end_year,
+        leaving the rest of the file byte-for-byte unchanged. When the new year range
+        has the same length, only the year is overwritten in place.
+        :param file_path: The path to the file to update
+        :return: The result of updating the file
+        """
+        if self.copyright_pattern is None or self.end_year is None:
+            raise ValueError("A copyright pattern and an end year are needed to update years.")
+        return self._run(self._update_years, file_path, exclusive=True)
+
+    def check_license(self, file_path: str) -> LicenseResult:
+        """
+        Check, without ever opening the file for writing, that the file carries the
+        license and that its copyright years are up to date. Only a bounded window at
+        the beginning of the file is mapped in memory and scanned.
+        :param file_path: The path to the file to check
+        :return: The result of checking the file, PRESENT, MISSING or STALE when supported
+        """
+        return self._run(self._check_license, file_path)
+
+    def _run(self, operation, file_path: str, exclusive: bool = False) -> LicenseResult:
+        """
+        Run an operation on a file, count its result and latency in self.stats, and
+        fill in the bytes and duration of the result.
+        :param operation: The method to run, called with the path and the FileType
+        :param file_path: The path to the file
+        :param exclusive: Hold the lock of the file while the operation runs, for
+            operations that change it
+        :return: The result of the operation
+        """
+        # The byte counters of this thread only move for this file meanwhile
+        counters = self.stats.thread_counters()
+        bytes_read = counters["bytes_read"]
+        bytes_written = counters["bytes_written"]
+        start = time.perf_counter_ns()
+        result = self._run_operation(operation, file_path, exclusive)
+        duration_ns = time.perf_counter_ns() - start
+        self.stats.add_result(result.status.label, result.reason, duration_ns)
+        return result._replace(
+            bytes_read=counters["bytes_read"] - bytes_read,
+            bytes_written=counters["bytes_written"] - bytes_written,
+            duration=duration_ns / 1e9,
+        )
 
-        if not file_type:
-            self.print_log(
-                f"File {file_path} with type '{file_extension}' not recognized, skipping...",
-                level="WARNING",
+    def _run_operation(self, operation, file_path: str, exclusive: bool = False) -> LicenseResult:
+        """
+        Run an operation on a file of a supported type, turning I/O errors into results
+        so that one bad file does not stop a whole run.
+        :param operation: The method to run, called with the path and the FileType
+        :param file_path: The path to the file
+        :param exclusive: Hold the lock of the file while the operation runs
+        :return: The result of the operation
+        """
+        try:
+            # Check if the file extension is valid (matches one of the defined
+            # file types)
+            file_type = self.classifier.classify(file_path)
+            if not file_type:
+                file_extension = os.path.splitext(file_path)[1]
+                return LicenseResult(
+                    file_path,
+                    LicenseStatus.SKIPPED,
+                    f"File {file_path} with type '{file_extension}' not recognized, skipping...",
+                    "unsupported",
+                )
+            if not exclusive:
+                return operation(file_path, file_type)
+            # The header is detected and written under the lock, so a second
+            # worker on the same file sees the header written by the first one
+            with self.file_lock(file_path):
+                return operation(file_path, file_type)
+        except FileNotFoundError:
+            return LicenseResult(
+                file_path,
+                LicenseStatus.ERROR,
+                f"The file {file_path} does not exist.",
+                "not-found",
+            )
+        except OSError as e:
+            return LicenseResult(
+                file_path,
+                LicenseStatus.ERROR,
+                f"The file {file_path} could not be processed: {e.strerror or e}.",
+                "os-error",
+            )
+        except ValueError as e:
+            # e.g. a path with an embedded NUL byte, from a file list or a request
+            return LicenseResult(
+                file_path,
+                LicenseStatus.ERROR,
+                f"The path {file_path!r} is invalid: {e}.",
+                "invalid-path",
             )
-            return
 
-        # Check if the file already contains the license in the beginning
-        with open(file_path, "r") as file:
-            content = file.read()
+    @classmethod
+    @contextmanager
+    def file_lock(cls, file_path: str):
+        """
+        Hold the lock of a file, shared by every path leading to it (relative paths,
+        links), while it is checked and changed. Locks are dropped once unused.
+        :param file_path: The path to the file
+        """
+        key = os.path.realpath(file_path)
+        with cls._file_locks_lock:
+            entry = cls._file_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with cls._file_locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del cls._file_locks[key]
+
+    def _sniff(self, file_path: str, size: int, sample: bytes) -> Optional[LicenseResult]:
+        """
+        Classify a file from its size and first bytes, before anything is decoded
+        :param file_path: The path to the file
+        :param size: The size of the file in bytes
+        :param sample: The first bytes of the file, at least SNIFF_SIZE if it is larger
+        :return: A SKIPPED result if the file must not be processed, None otherwise
+        """
+        if self.max_file_size is not None and size > self.max_file_size:
+            return LicenseResult(
+                file_path,
+                LicenseStatus.SKIPPED,
+                f"File {file_path} is larger than {self.max_file_size} bytes, skipping...",
+                "oversize",
+            )
+        sample = sample[:SNIFF_SIZE]
+        if b"\0" in sample:
+            return LicenseResult(
+                file_path,
+                LicenseStatus.SKIPPED,
+                f"File {file_path} looks binary, skipping...",
+                "binary",
+            )
+        if GENERATED_MARKERS.search(self.leading_comments(sample)):
+            return LicenseResult(
+                file_path,
+                LicenseStatus.SKIPPED,
+                f"File {file_path} is generated, skipping...",
+                "generated",
+            )
+        return None
 
-            if self.is_license_present(content, file_type):
-                self.print_log(
+    def _is_unchanged(self, file_path: str, fingerprint: str) -> bool:
+        """Check if the manifest, if any, says the file passed on a previous run."""
+        return self.manifest is not None and self.manifest.is_unchanged(
+            file_path, os.stat(file_path), fingerprint
+        )
+
+    def _process_file(self, file_path: str, file_type: FileType) -> LicenseResult:
+        """Process a single file of a supported type, see process_file."""
+        # Skip the file without opening it if it passed on a previous run
+        fingerprint = self.header_fingerprints[file_type.comment_style]
+        if self._is_unchanged(file_path, fingerprint):
+            return LicenseResult(
+                file_path,
+                LicenseStatus.PRESENT,
+                f"License already exists in {file_path}. No changes made.",
+            )
+
+        # Check if the file already contains the license in the beginning,
+        # either exactly as we would write it or in any other comment block
+        with open(file_path, "rb") as file:
+            with self.stats.phase("read"):
+                sample = file.read(max(SNIFF_SIZE, self.max_header_size))
+                self.stats.add("bytes_read", len(sample))
+                layout = TextLayout.detect(sample)
+                skipped = self._sniff(
+                    file_path, os.fstat(file.fileno()).st_size, layout.decode_prefix(sample)
+                )
+            if skipped is not None:
+                return skipped
+            # The header in the encoding and newline of the file
+            header = self.header_variants[
+                (file_type.comment_style, layout.encoding, layout.newline)
+            ]
+            with self.stats.phase("detect"):
+                present = sample.startswith(
+                    header, len(layout.bom)
+                ) or self._is_license_in_file(file, file_type, layout)
+                # Only count what the text scan read beyond the sample
+                self.stats.add("bytes_read", max(file.tell() - len(sample), 0))
+            if present:
+                self._record(file_path, fingerprint)
+                return LicenseResult(
+                    file_path,
+                    LicenseStatus.PRESENT,
                     f"License already exists in {file_path}. No changes made.",
-                    level="INFO",
                 )
+
+        # Add the formatted license text at the beginning of the file, after its BOM
+        self.write_license_header(file_path, layout.bom + header, len(layout.bom))
+
+        self._record(file_path, fingerprint)
+        return LicenseResult(
+            file_path, LicenseStatus.ADDED, f"License added successfully to {file_path}."
+        )
+
+    def _update_years(self, file_path: str, file_type: FileType) -> LicenseResult:
+        """Update the copyright years of a single file of a supported type, see update_years."""
+        fingerprint = self.years_fingerprints[file_type.comment_style]
+        if self._is_unchanged(file_path, fingerprint):
+            return LicenseResult(
+                file_path,
+                LicenseStatus.PRESENT,
+                f"Copyright years already up to date in {file_path}. No changes made.",
+            )
+
+        # Opened for reading only, so that files already up to date are never
+        # opened for writing (which would also fire close-write events)
+        with open(file_path, "rb") as file:
+            with self.stats.phase("read"):
+                prefix = file.read(MAX_HEADER_SIZE)
+                self.stats.add("bytes_read", len(prefix))
+                layout = TextLayout.detect(prefix)
+                text = layout.decode_prefix(prefix)
+                skipped = self._sniff(file_path, os.fstat(file.fileno()).st_size, text)
+            if skipped is not None:
+                return skipped
+
+            with self.stats.phase("detect"):
+                region = self.header_region(text)
+                match = self.copyright_pattern.search(region)
+            if match is None:
+                return LicenseResult(
+                    file_path,
+                    LicenseStatus.SKIPPED,
+                    f"No copyright line found in {file_path}, skipping...",
+                    "no-copyright",
+                )
+            if "end_year" not in match.groupdict():
+                # The copyright line of the license (e.g. the GPL) has no end year
+                return LicenseResult(
+                    file_path,
+                    LicenseStatus.SKIPPED,
+                    f"The license has no end year to update in {file_path}, skipping...",
+                    "no-end-year",
+                )
+
+            if match.group("end_year") == str(self.end_year).encode("ascii"):
+                self._record(file_path, fingerprint)
+                return LicenseResult(
+                    file_path,
+                    LicenseStatus.PRESENT,
+                    f"Copyright years already up to date in {file_path}. No changes made.",
+                )
+
+            # The year and the header region as offsets in the file, and the new
+            # year in the encoding of the file
+            new_end_year = str(self.end_year).encode(layout.encoding)
+            start = layout.file_offset(region, match.start("end_year"))
+            end = layout.file_offset(region, match.end("end_year"))
+            region_end = layout.file_offset(region, len(region))
+
+        if len(new_end_year) == end - start:
+            # Patch the year where it is, the rest of the file is not touched
+            with self.stats.phase("write"):
+                with open(file_path, "r+b") as file:
+                    file.seek(start)
+                    file.write(new_end_year)
+                self.stats.add("bytes_written", len(new_end_year))
+        else:
+            self.write_license_header(
+                file_path, prefix[:start] + new_end_year + prefix[end:region_end], region_end
+            )
+
+        self._record(file_path, fingerprint)
+        return LicenseResult(
+            file_path, LicenseStatus.UPDATED, f"Copyright years updated in {file_path}."
+        )
+
+    def _check_license(self, file_path: str, file_type: FileType) -> LicenseResult:
+        """Check a single file of a supported type, see check_license."""
+        # Only reuse the entries of runs that also compared the end year
+        if self.copyright_pattern is not None and self.end_year is not None:
+            fingerprint = self.years_fingerprints[file_type.comment_style]
+        else:
+            fingerprint = self.header_fingerprints[file_type.comment_style]
+        if self._is_unchanged(file_path, fingerprint):
+            return LicenseResult(
+                file_path, LicenseStatus.PRESENT, f"License is up to date in {file_path}."
+            )
+
+        with self.stats.phase("read"):
+            with open(file_path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                window = b""
+                if size > 0:
+                    # Map only the window, the rest of the file is never touched
+                    with mmap.mmap(
+                        file.fileno(), min(size, MAX_HEADER_SIZE), access=mmap.ACCESS_READ
+                    ) as mapped:
+                        window = mapped[:]
+            self.stats.add("bytes_read", len(window))
+            layout = TextLayout.detect(window)
+            text = layout.decode_prefix(window)
+            skipped = self._sniff(file_path, size, text)
+        if skipped is not None:
+            return skipped
+
+        with self.stats.phase("detect"):
+            header = self.header_variants[
+                (file_type.comment_style, layout.encoding, layout.newline)
+            ]
+            region = self.header_region(text)
+            present = window.startswith(header, len(layout.bom)) or self.is_license_in_lines(
+                region.decode("utf-8", errors="replace").splitlines(), file_type
+            )
+            stale = False
+            if present and self.copyright_pattern is not None and self.end_year is not None:
+                match = self.copyright_pattern.search(region)
+                stale = (
+                    match is not None
+                    and "end_year" in match.groupdict()
+                    and match.group("end_year") != str(self.end_year).encode("ascii")
+                )
+
+        if not present:
+            return LicenseResult(
+                file_path, LicenseStatus.MISSING, f"License is missing in {file_path}."
+            )
+
+        if stale:
+            return LicenseResult(
+                file_path,
+                LicenseStatus.STALE,
+                f"Copyright years are out of date in {file_path}.",
+            )
+
+        self._record(file_path, fingerprint)
+        return LicenseResult(
+            file_path, LicenseStatus.PRESENT, f"License is up to date in {file_path}."
+        )
+
+    @staticmethod
+    def header_region(prefix: bytes) -> bytes:
+        """
+        Cut the beginning of a file after MAX_HEADER_LINES lines
+        :param prefix: The first bytes of the file
+        :return: The bytes of the header region
+        """
+        end = -1
+        for _ in range(MAX_HEADER_LINES):
+            end = prefix.find(b"\n", end + 1)
+            if end == -1:
+                return prefix
+        return prefix[:end + 1]
+
+    @staticmethod
+    def leading_comments(prefix: bytes) -> bytes:
+        """
+        Cut the beginning of a file at its first line of code, or after MAX_HEADER_LINES
+        lines, keeping only its leading comments and blank lines
+        :param prefix: The first bytes of the file
+        :return: The bytes of the leading comments
+        """
+        end = 0
+        closing = None
+        for line in prefix.splitlines(keepends=True)[:MAX_HEADER_LINES]:
+            stripped = line.strip()
+            if closing is not None:
+                # Inside a block comment, any line goes until it is closed
+                if closing in stripped:
+                    closing = None
+            elif not stripped or stripped.startswith(LEADING_COMMENT_PREFIXES):
+                for opening, block_closing in BLOCK_COMMENTS:
+                    if stripped.startswith(opening):
+                        if block_closing not in stripped[len(opening):]:
+                            closing = block_closing
+            else:
+                break
+            end += len(line)
+        return prefix[:end]
+
+    def write_license_header(self, file_path: str, header: bytes, body_offset: int = 0):
+        """
+        Insert the header at the beginning of the file without loading the file into memory.
+        The header and then the original content are written to a temporary file in the
+        same folder, which keeps the mode and ownership of the original file and replaces
+        it atomically. If anything fails, the original file is left untouched.
+        :param file_path: The path to the file
+        :param header: The encoded header, including its trailing newline
+        :param body_offset: Where the original content to keep starts, the bytes before
+            it are replaced by the header
+        """
+        with self.stats.phase("write"):
+            self._write_license_header(file_path, header, body_offset)
+
+    def _write_license_header(self, file_path: str, header: bytes, body_offset: int):
+        """Insert the header at the beginning of the file, see write_license_header."""
+        # Write through symbolic links: the file they point to gets the header,
+        # and the links are kept
+        file_path = os.path.realpath(file_path)
+        directory = os.path.dirname(file_path)
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp"
+        )
+        try:
+            source_fd = os.open(file_path, os.O_RDONLY)
+            try:
+                source_stat = os.fstat(source_fd)
+                os.fchmod(temp_fd, stat.S_IMODE(source_stat.st_mode))
+                try:
+                    os.fchown(temp_fd, source_stat.st_uid, source_stat.st_gid)
+                except PermissionError:
+                    # Only the owner of the file (or root) may change it, keep ours
+                    pass
+                view = memoryview(header)
+                while view:
+                    view = view[os.write(temp_fd, view):]
+                os.lseek(source_fd, body_offset, os.SEEK_SET)
+                self._copy_body(source_fd, temp_fd)
+            finally:
+                os.close(source_fd)
+            os.close(temp_fd)
+            temp_fd = None
+            os.replace(temp_path, file_path)
+            self.stats.add(
+                "bytes_written", len(header) + max(source_stat.st_size - body_offset, 0)
+            )
+        except BaseException:
+            if temp_fd is not None:
+                os.close(temp_fd)
+            os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def _copy_body(source_fd: int, target_fd: int):
+        """
+        Copy the rest of the source file to the target file in COPY_CHUNK_SIZE chunks.
+        Where available, the copy is done by the kernel with copy_file_range or sendfile,
+        so the bytes never pass through Python.
+        :param source_fd: The file descriptor to copy from, at its current position
+        :param target_fd: The file descriptor to copy to, at its current position
+        """
+        # Both calls move the file positions, so a partial copy is resumed by the
+        # next method if the kernel refuses to go on (e.g. across file systems)
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(source_fd, target_fd, COPY_CHUNK_SIZE):
+                    pass
                 return
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                    raise
+        if hasattr(os, "sendfile"):
+            try:
+                while os.sendfile(target_fd, source_fd, None, COPY_CHUNK_SIZE):
+                    pass
+                return
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                    raise
 
-        # Get the comment style associated with this file type
-        comment_style = file_type.comment_style.value
+        with open(source_fd, "rb", closefd=False) as source, open(
+            target_fd, "wb", closefd=False
+        ) as target:
+            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
 
-        # Format the license text with the correct comment style
-        license_with_comment = self.format_license_with_comments(comment_style)
+    def _record(self, file_path: str, fingerprint: str):
+        """Record in the manifest, if any, that the file carries the license."""
+        if self.manifest is not None:
+            self.manifest.record(file_path, os.stat(file_path), fingerprint)
 
-        # Add the formatted license text at the beginning of the file
-        with open(file_path, "r+") as file:
-            original_content = file.read()
-            file.seek(0, 0)  # Move the file pointer to the beginning
-            file.write(license_with_comment + "\n" + original_content)
+    def report(self, result: LicenseResult):
+        """Log the result of processing a single file."""
+        self.print_log(result.message, level=result.status.level)
 
-        self.print_log(f"License added successfully to {file_path}.", level="INFO")
+    def _is_license_in_file(
+        self, file, file_type: FileType, layout: TextLayout = TextLayout()
+    ) -> bool:
+        """
+        Check the beginning of a file opened in binary mode for a license comment block.
+        Only the lines scanned are decoded.
+        :param file: A file object opened in binary mode
+        :param file_type: The FileType of the file
+        :param layout: The TextLayout of the file
+        :return: True if a license is present, False otherwise
+        """
+        file.seek(len(layout.bom))
+        text = io.TextIOWrapper(file, encoding=layout.encoding, errors="replace")
+        try:
+            return self.is_license_in_lines(self.iter_header_lines(text), file_type)
+        finally:
+            # Leave the binary file open, it is closed by its owner
+            text.detach()
+
+    @staticmethod
+    def iter_header_lines(file):
+        """
+        Yield the first lines of an open file, reading no more than MAX_HEADER_LINES
+        lines and MAX_HEADER_SIZE characters. A single enormous line is cut at the
+        size limit instead of being read whole.
+        :param file: A file object opened for reading
+        """
+        remaining = MAX_HEADER_SIZE
+        for _ in range(MAX_HEADER_LINES):
+            line = file.readline(remaining)
+            if not line:
+                return
+            yield line
+            remaining -= len(line)
+            if remaining <= 0:
+                return
 
     def is_license_present(self, content: str, file_type: str) -> bool:
         """
-        Check if the content of the first 50 lines contains a valid comment block 
+        Check if the content of the first 30 lines contains a valid comment block 
         with a license-related keyword.
         The comment block must be in the format specified by 
         the file's type (e.g., /* */, <!-- -->).
@@ -129,31 +933,36 @@ class LicenseManager:
         :return: True if a license-related keyword is found inside a valid comment block,
             False otherwise
         """
-        # Determine the comment style based on the file type
-        comment_style = file_type.comment_style.value
+        lines = content[:MAX_HEADER_SIZE].splitlines()[:MAX_HEADER_LINES]
+        return self.is_license_in_lines(lines, file_type)
 
-        # Split the content into lines
-        lines = content.splitlines()
+    def is_license_in_lines(self, lines, file_type: str) -> bool:
+        """
+        Same as is_license_present, but takes the first lines of the file as an iterable.
+        The lines are consumed lazily, so nothing after the end of the comment block is read.
 
-        # Only consider the first 30 lines
-        lines_to_check = lines[:30]
+        :param lines: An iterable over the first lines of the file
+        :param file_type: The FileType of the file
+        :return: True if a license-related keyword is found inside a valid comment block,
+            False otherwise
+        """
+        # Determine the comment style based on the file type
+        comment_style = file_type.comment_style.value
 
         # Initialize a flag to check if we are inside a comment block
         inside_comment_block = False
         comment_block_lines = []
 
-        # Iterate through the first 50 lines to find the comment block
-        for line in lines_to_check:
+        # Iterate through the first lines to find the comment block
+        for line in lines:
             line = line.strip()  # Strip leading/trailing spaces
 
             # Check for the start of the comment block
             if comment_style == CommentStyle.SINGLE_LINE.value and line.startswith(
                 comment_style
             ):
-                # For single-line comments, we can check for keywords
-                # immediately
-                if any(keyword.value in line for keyword in LicenseKeyword):
-                    return True
+                # For single-line comments, every commented line counts
+                comment_block_lines.append(line)
             elif comment_style == CommentStyle.MULTI_LINE.value:
                 # For multi-line comments, check for the start and end of the
                 # comment block
@@ -178,20 +987,13 @@ class LicenseManager:
                 elif inside_comment_block:
                     comment_block_lines.append(line)
 
-        # After collecting the comment block lines, check if any of the lines
-        # contain license-related keywords
-        for comment_line in comment_block_lines:
-            if any(keyword.value in comment_line for keyword in LicenseKeyword):
-                return True
-
-        return False
+        # After collecting the comment block lines, check them all at once
+        # for license-related keywords
+        return self.keyword_matcher.search("\n".join(comment_block_lines))
 
     def get_file_type(self, file_extension: str) -> FileType:
         """Returns the appropriate FileType enum based on the file extension."""
-        for file_type in FileType:
-            if file_extension == file_type.extension:
-                return file_type
-        return None
+        return self.classifier.classify_extension(file_extension)
 
     def format_license_with_comments(self, comment_style: str) -> str:
         """
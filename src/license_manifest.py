@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import hashlib
+import json
+import os
+import threading
+
+
+class LicenseManifest:
+    """
+    On-disk record of the files that already carry the license, so that unchanged
+    files can be skipped on the next run with a single stat call.
+
+    Each entry is keyed by path and stores (size, mtime_ns, inode, header fingerprint).
+    The whole manifest is tied to a hash of the license configuration: when the
+    license text changes, the stored entries are discarded.
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_file: str, config_hash: str):
+        """
+        Initialize the LicenseManifest and load the entries of a previous run
+        :param manifest_file: The path to the manifest file
+        :param config_hash: The fingerprint of the license configuration of this run
+        """
+        self.manifest_file = manifest_file
+        self.config_hash = config_hash
+        self.entries = self._load_entries()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(text: str) -> str:
+        """
+        Compute a short, stable fingerprint of a text
+        :param text: The text to fingerprint, e.g. the license text or a formatted header
+        :return: The fingerprint as a hex string
+        """
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _load_entries(self) -> dict:
+        """Load the entries from the manifest file, or start empty if it is missing or stale"""
+        try:
+            with open(self.manifest_file, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.VERSION
+            or data.get("config") != self.config_hash
+        ):
+            return {}
+        return data.get("files", {})
+
+    def is_unchanged(self, file_path: str, stat: os.stat_result, fingerprint: str) -> bool:
+        """
+        Check if a file is unchanged since it was recorded with the same header
+        :param file_path: The path to the file
+        :param stat: The current stat result of the file
+        :param fingerprint: The fingerprint of the header the file should carry
+        :return: True if the file can be skipped, False otherwise
+        """
+        entry = self.entries.get(file_path)
+        return entry is not None and entry == [
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+            fingerprint,
+        ]
+
+    def record(self, file_path: str, stat: os.stat_result, fingerprint: str):
+        """
+        Record that a file carries the license
+        :param file_path: The path to the file
+        :param stat: The stat result of the file after it was checked or modified
+        :param fingerprint: The fingerprint of the header the file carries
+        """
+        with self._lock:
+            self.entries[file_path] = [
+                stat.st_size,
+                stat.st_mtime_ns,
+                stat.st_ino,
+                fingerprint,
+            ]
+
+    def save(self):
+        """Write the manifest to disk, replacing the previous one atomically"""
+        temp_file = f"{self.manifest_file}.tmp"
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "config": self.config_hash,
+                "files": self.entries,
+            }
+            with open(temp_file, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_file, self.manifest_file)
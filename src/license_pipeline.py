@@ -0,0 +1,116 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Bounded stages for streaming a run through constant memory.
+
+A run is a chain of generators, each one pulling from the previous one:
+
+    discover (walk, git or list) -> classify -> process (sniff, detect, write) -> report
+
+Discovery and classification run ahead of processing in their own thread, through
+a bounded buffer, and processing keeps a bounded window of files in flight (see
+ordered_map below). Every stage blocks when the next one falls behind, so the memory
+used does not depend on the number of files.
+"""
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Number of items a stage may produce ahead of its consumer
+DEFAULT_BUFFER_SIZE = 1024
+
+# Marks the end of the items in a buffer
+_END = object()
+
+
+class _Failure:
+    """Carries an exception of the producer thread to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(items: Iterable[T], buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[T]:
+    """
+    Produce the items of an iterable in a background thread, at most buffer_size
+    items ahead of the consumer, so that e.g. walking a tree overlaps with
+    processing its files. An exception of the producer, including SystemExit, is
+    raised in the consumer. If the consumer stops early, the producer stops too.
+    :param items: An iterable, typically a generator
+    :param buffer_size: The size of the bounded buffer between the two threads
+    """
+    buffer = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        """Wait for room in the buffer, returns False if the consumer is gone."""
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_END)
+
+    producer = threading.Thread(target=produce, name="prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def ordered_map(func, items, jobs: int):
+    """
+    Apply func to every item using a pool of worker threads, yielding the results
+    in the same order as the items. At most a few tasks per worker are in flight,
+    so the items are consumed lazily.
+    :param func: The function to apply to each item
+    :param items: An iterable of items
+    :param jobs: The number of worker threads, 1 runs everything in the calling thread
+    """
+    if jobs <= 1:
+        yield from map(func, items)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= jobs * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
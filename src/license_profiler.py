@@ -0,0 +1,83 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import cProfile
+import tracemalloc
+
+# Profilers selectable with --profile
+PROFILE_MODES = ("cpu", "mem")
+
+# Where the CPU profile is written by default
+DEFAULT_PROFILE_OUTPUT = "autolicense.pstats"
+
+# Number of allocation sites listed by the memory profile
+TOP_ALLOCATIONS = 10
+
+
+def profile_call(mode: str, output: str, func, *args):
+    """
+    Call a function under a profiler.
+    With 'cpu', cProfile records the calling thread and the statistics are written to
+    output as a .pstats file, to be read with pstats or snakeviz.
+    With 'mem', tracemalloc records the allocations of every thread, and the top
+    allocation sites and the peak of traced memory are printed.
+    The profile is written even if the function raises.
+    :param mode: One of PROFILE_MODES
+    :param output: The path of the .pstats file written by the CPU profile
+    :param func: The function to call
+    :param args: The arguments of the function
+    :return: What the function returns
+    """
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args)
+        finally:
+            profiler.dump_stats(output)
+            print(f"CPU profile written to {output}")
+
+    if mode == "mem":
+        tracemalloc.start()
+        try:
+            return func(*args)
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print_memory_report(snapshot, peak)
+
+    raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}.")
+
+
+def print_memory_report(snapshot: tracemalloc.Snapshot, peak: int):
+    """
+    Print the allocation sites holding the most memory and the peak of traced memory.
+    :param snapshot: The tracemalloc snapshot taken at the end of the run
+    :param peak: The peak of traced memory in bytes
+    """
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+    )
+    print(f"Peak traced memory: {peak / 1024:.1f} KiB")
+    print(f"Top {TOP_ALLOCATIONS} allocation sites:")
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        print(
+            f"  {frame.filename}:{frame.lineno}: "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        )
@@ -0,0 +1,168 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Selects the license of each file from a rules file, so that one walk of a tree can
+apply different licenses to different subtrees.
+
+The rules file is a JSON object with a list of rules, each mapping path patterns to
+the license type, author and years to use, e.g.:
+
+    {"rules": [
+        {"paths": ["third_party/", "*.proto"], "license_type": "Apache License 2.0"},
+        {"paths": ["internal/**/*.py"], "author": "ACME Corp.", "start_year": 2019}
+    ]}
+
+Patterns use the .gitignore format, relative to the target folder, and a pattern
+naming a folder covers everything below it. The first matching rule wins. The
+fields a rule leaves out, and the files no rule matches, use the command-line values.
+"""
+import json
+import os
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from src.error_handler import handle_error
+from src.ignore_matcher import IgnoreRules
+
+# Fields a rule may set, with their type
+RULE_FIELDS = {
+    "license_type": str,
+    "author": str,
+    "start_year": int,
+    "end_year": int,
+}
+
+
+class LicenseRule(NamedTuple):
+    """A rule of a rules file, None fields fall back to the command-line values."""
+
+    patterns: Tuple[str, ...]
+    license_type: Optional[str] = None
+    author: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+
+
+class LicenseRules:
+    """
+    The rules of a rules file, compiled into a single regular expression with one
+    group per rule, in order, so that matching a path is one regex call whatever the
+    number of rules.
+    """
+
+    def __init__(self, rules: List[LicenseRule], folder: str):
+        """
+        Compile the rules
+        :param rules: The rules, in order of precedence
+        :param folder: The folder the patterns are relative to
+        """
+        self.rules = rules
+        self.folder = os.path.join(folder, "")
+        self.regex = None
+        if rules:
+            self.regex = re.compile(
+                "|".join(
+                    "(" + "|".join(self.translate(pattern) for pattern in rule.patterns) + ")"
+                    for rule in rules
+                ),
+                re.DOTALL,
+            )
+
+    @classmethod
+    def load(cls, rules_file: str, folder: str) -> "LicenseRules":
+        """
+        Load and check a rules file, exiting with an error message if it is invalid
+        :param rules_file: The path to the JSON rules file
+        :param folder: The folder the patterns are relative to
+        :return: The compiled LicenseRules
+        """
+        try:
+            with open(rules_file, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            handle_error(f"Rules file '{rules_file}' not found.")
+        except json.JSONDecodeError:
+            handle_error(
+                f"Failed to parse the rules file '{rules_file}'. Please check the file format."
+            )
+
+        if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+            handle_error(f"Rules file '{rules_file}' must contain a list of 'rules'.")
+        return cls([cls.parse_rule(rules_file, rule) for rule in data["rules"]], folder)
+
+    @staticmethod
+    def parse_rule(rules_file: str, data) -> LicenseRule:
+        """
+        Check and convert one rule of a rules file
+        :param rules_file: The path to the rules file, for error messages
+        :param data: The rule as parsed from JSON
+        :return: The LicenseRule
+        """
+        if not isinstance(data, dict):
+            handle_error(f"Every rule in '{rules_file}' must be an object.")
+        patterns = data.get("paths")
+        if (
+            not isinstance(patterns, list)
+            or not patterns
+            or not all(isinstance(pattern, str) and pattern.strip("/") for pattern in patterns)
+        ):
+            handle_error(f"Every rule in '{rules_file}' needs a non-empty list of 'paths'.")
+        fields = {}
+        for name, value in data.items():
+            if name == "paths":
+                continue
+            if name not in RULE_FIELDS:
+                handle_error(f"Unknown field '{name}' in a rule of '{rules_file}'.")
+            if not isinstance(value, RULE_FIELDS[name]) or isinstance(value, bool):
+                handle_error(
+                    f"Field '{name}' in a rule of '{rules_file}' must be "
+                    f"a {RULE_FIELDS[name].__name__}."
+                )
+            fields[name] = value
+        return LicenseRule(tuple(patterns), **fields)
+
+    @staticmethod
+    def translate(pattern: str) -> str:
+        """
+        Translate a pattern to a regular expression without capturing groups that
+        matches the paths of the files it covers
+        :param pattern: The pattern, in the .gitignore format
+        :return: The regular expression
+        """
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # A slash at the beginning or in the middle anchors the pattern to the
+        # target folder, otherwise it matches at any depth
+        anchored = "/" in pattern
+        regex = IgnoreRules.translate(pattern.lstrip("/"))
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        return regex + ("/.*" if dir_only else "(?:/.*)?")
+
+    def match(self, file_path: str) -> Optional[int]:
+        """
+        Find the rule of a file
+        :param file_path: The path to the file, inside the folder of the rules
+        :return: The index of the first matching rule, or None if no rule matches
+        """
+        if self.regex is None:
+            return None
+        if file_path.startswith(self.folder):
+            relative_path = file_path[len(self.folder):]
+        else:
+            relative_path = os.path.relpath(file_path, self.folder)
+        if os.sep != "/":
+            relative_path = relative_path.replace(os.sep, "/")
+        match = self.regex.fullmatch(relative_path)
+        return None if match is None else match.lastindex - 1
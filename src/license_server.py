@@ -0,0 +1,179 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Serves license requests from a long-running process, so that editor plugins and
+hooks do not pay for the interpreter startup, the license file parse and the header
+rendering on every call.
+
+Requests and responses are JSON-RPC 2.0 objects, one per line, e.g.:
+
+    --> {"jsonrpc": "2.0", "id": 1, "method": "check", "params": {"paths": ["src/a.py"]}}
+    <-- {"jsonrpc": "2.0", "id": 1, "result": [{"path": "src/a.py", "status": "missing", ...}]}
+
+The methods are 'check', 'add' and 'update-years', taking a list of paths. A request
+without an "id" is a notification: it is carried out, but never answered.
+"""
+import json
+import os
+import socketserver
+import stat
+from typing import Callable, Optional
+from src.license_manager import LicenseManager, LicenseResult
+
+# Methods of the server, and the LicenseManager method each one calls
+METHODS = {
+    "check": LicenseManager.check_license,
+    "add": LicenseManager.process_file,
+    "update-years": LicenseManager.update_years,
+}
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+class LicenseServer:
+    """
+    Answers newline-delimited JSON-RPC requests on a stream or a Unix socket, with
+    LicenseManagers and headers that stay in memory between requests.
+    """
+
+    def __init__(self, select_manager: Callable[[str], LicenseManager]):
+        """
+        Initialize the LicenseServer
+        :param select_manager: Returns the LicenseManager of a path, e.g. from the rules
+        """
+        self.select_manager = select_manager
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """
+        Answer one line of input
+        :param line: A JSON-RPC request
+        :return: The JSON response, or None for a blank line or a notification
+        """
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return self._encode(self._error(None, PARSE_ERROR, f"Parse error: {e}"))
+        response = self.handle(request)
+        return self._encode(response) if response is not None else None
+
+    def handle(self, request) -> Optional[dict]:
+        """
+        Answer one request
+        :param request: The decoded JSON-RPC request
+        :return: The response object, or None if the request is a notification
+        """
+        if (
+            not isinstance(request, dict)
+            or request.get("jsonrpc") != "2.0"
+            or not isinstance(request.get("method"), str)
+        ):
+            return self._error(None, INVALID_REQUEST, "Invalid request.")
+        response = self._respond(request)
+        # Notifications are never answered, not even with an error
+        return response if "id" in request else None
+
+    def _respond(self, request: dict) -> dict:
+        """Carry out a valid request, see handle."""
+        request_id = request.get("id")
+
+        operation = METHODS.get(request["method"])
+        if operation is None:
+            return self._error(
+                request_id, METHOD_NOT_FOUND, f"Unknown method '{request['method']}'."
+            )
+
+        params = request.get("params")
+        paths = params.get("paths") if isinstance(params, dict) else None
+        if not isinstance(paths, list) or not all(
+            isinstance(path, str) and "\0" not in path for path in paths
+        ):
+            return self._error(request_id, INVALID_PARAMS, "'params.paths' must be a list of paths.")
+
+        results = [operation(self.select_manager(path), path) for path in paths]
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": [self.result_record(result) for result in results],
+        }
+
+    @staticmethod
+    def result_record(result: LicenseResult) -> dict:
+        """Returns a LicenseResult as a JSON object."""
+        return {
+            "path": result.path,
+            "status": result.status.label,
+            "reason": result.reason,
+            "message": result.message,
+            "bytes_read": result.bytes_read,
+            "bytes_written": result.bytes_written,
+            "duration": result.duration,
+        }
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> dict:
+        """Returns a JSON-RPC error response."""
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    @staticmethod
+    def _encode(response: dict) -> str:
+        """Encode a response as one line of JSON."""
+        return json.dumps(response, separators=(",", ":")) + "\n"
+
+    def serve_stream(self, infile, outfile):
+        """
+        Answer the requests read from a text stream until it ends
+        :param infile: The stream the requests are read from, e.g. sys.stdin
+        :param outfile: The stream the responses are written to, e.g. sys.stdout
+        """
+        for line in infile:
+            response = self.handle_line(line)
+            if response is not None:
+                outfile.write(response)
+                # Answer now, the client waits for it before sending the next request
+                outfile.flush()
+
+    def serve_socket(self, socket_path: str):
+        """
+        Answer the requests of the clients of a Unix socket, each in its own thread,
+        until interrupted
+        :param socket_path: The path of the socket, a stale socket there is replaced
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    response = server.handle_line(line.decode("utf-8", errors="replace"))
+                    if response is not None:
+                        self.wfile.write(response.encode("utf-8"))
+
+        try:
+            if stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as unix_server:
+            unix_server.daemon_threads = True
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(socket_path)
@@ -0,0 +1,220 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+import json
+import math
+import threading
+import time
+import weakref
+from collections import Counter
+
+# Phases of a run, in pipeline order
+PHASES = ("walk", "read", "detect", "format", "write")
+
+# Per-file latencies are kept in a histogram with this many buckets per power
+# of two, so percentiles are within about 9% whatever the number of files
+HISTOGRAM_BUCKETS_PER_OCTAVE = 8
+
+
+class _StatsBucket:
+    """The statistics collected by one thread."""
+
+    def __init__(self):
+        self.phase_ns = Counter()
+        self.counters = Counter()
+        self.statuses = Counter()
+        self.skipped = Counter()
+        self.latencies = Counter()
+
+    def merge(self, other: "_StatsBucket"):
+        """Add the statistics of another bucket to this one."""
+        self.phase_ns.update(other.phase_ns)
+        self.counters.update(other.counters)
+        self.statuses.update(other.statuses)
+        self.skipped.update(other.skipped)
+        self.latencies.update(other.latencies)
+
+
+class _ThreadToken:
+    """Lives in the thread-local storage of a thread, and dies with the thread."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _PhaseTimer:
+    """Context manager adding the time spent in its block to a phase."""
+
+    __slots__ = ("phase_ns", "phase", "start")
+
+    def __init__(self, phase_ns: Counter, phase: str):
+        self.phase_ns = phase_ns
+        self.phase = phase
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.phase_ns[self.phase] += time.perf_counter_ns() - self.start
+
+
+class LicenseStats:
+    """
+    Low-overhead timers and counters for a run: the time spent in each phase, the
+    number of files by status and skip reason, the bytes read and written, and a
+    histogram of the per-file latency.
+
+    Every thread updates its own bucket without locking, the buckets are only
+    merged when the report is built. When a thread ends, its bucket is folded into
+    a retired total, so that short-lived threads (one per server connection, one
+    pool per watched batch) do not pile up in a long-running process.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics"""
+        self._local = threading.local()
+        self._buckets = set()
+        self._retired = _StatsBucket()
+        self._lock = threading.Lock()
+
+    def _bucket(self) -> _StatsBucket:
+        """Returns the bucket of the calling thread, creating it on first use."""
+        bucket = getattr(self._local, "bucket", None)
+        if bucket is None:
+            bucket = self._local.bucket = _StatsBucket()
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, self._retire, bucket)
+            with self._lock:
+                self._buckets.add(bucket)
+        return bucket
+
+    def _retire(self, bucket: _StatsBucket):
+        """Fold the bucket of a thread that ended into the retired total."""
+        with self._lock:
+            self._buckets.discard(bucket)
+            self._retired.merge(bucket)
+
+    def phase(self, phase: str) -> _PhaseTimer:
+        """
+        Time a block of code as part of a phase
+        :param phase: One of PHASES
+        :return: A context manager timing its block
+        """
+        return _PhaseTimer(self._bucket().phase_ns, phase)
+
+    def timed(self, items, phase: str):
+        """
+        Yield the items of an iterable, timing how long each one takes to produce
+        as part of a phase (e.g. the walk of the target folder)
+        :param items: An iterable, typically a generator
+        :param phase: One of PHASES
+        """
+        phase_ns = self._bucket().phase_ns
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                phase_ns[phase] += time.perf_counter_ns() - start
+                return
+            phase_ns[phase] += time.perf_counter_ns() - start
+            yield item
+
+    def add(self, counter: str, amount: int = 1):
+        """
+        Increment a counter, e.g. 'bytes_read' or 'bytes_written'
+        :param counter: The name of the counter
+        :param amount: The amount to add
+        """
+        self._bucket().counters[counter] += amount
+
+    def thread_counters(self) -> Counter:
+        """
+        Returns the counters of the calling thread, e.g. to measure what one file
+        adds to them. They must only be read, never changed.
+        """
+        return self._bucket().counters
+
+    def add_result(self, status: str, reason: str, duration_ns: int):
+        """
+        Count a processed file
+        :param status: The label of its LicenseStatus
+        :param reason: The reason it was skipped, if it was
+        :param duration_ns: The time spent on the file in nanoseconds
+        """
+        bucket = self._bucket()
+        bucket.statuses[status] += 1
+        if reason:
+            bucket.skipped[reason] += 1
+        bucket.latencies[self._latency_bucket(duration_ns)] += 1
+
+    @staticmethod
+    def _latency_bucket(duration_ns: int) -> int:
+        """Returns the histogram bucket of a latency."""
+        return int(math.log2(max(duration_ns, 1)) * HISTOGRAM_BUCKETS_PER_OCTAVE)
+
+    @staticmethod
+    def _percentile(latencies: Counter, fraction: float) -> float:
+        """Returns the upper bound, in milliseconds, of the bucket holding a percentile."""
+        total = sum(latencies.values())
+        if not total:
+            return 0.0
+        rank = math.ceil(total * fraction)
+        seen = 0
+        for bucket in sorted(latencies):
+            seen += latencies[bucket]
+            if seen >= rank:
+                return 2 ** ((bucket + 1) / HISTOGRAM_BUCKETS_PER_OCTAVE) / 1e6
+        return 0.0
+
+    def merged(self) -> _StatsBucket:
+        """Returns the statistics of all threads added together."""
+        total = _StatsBucket()
+        with self._lock:
+            total.merge(self._retired)
+            for bucket in self._buckets:
+                total.merge(bucket)
+        return total
+
+    def report(self) -> dict:
+        """
+        Build the report of the run
+        :return: A dictionary that can be written as JSON
+        """
+        total = self.merged()
+        return {
+            "files_seen": sum(total.statuses.values()),
+            "statuses": dict(total.statuses),
+            "skipped": dict(total.skipped),
+            "already_licensed": total.statuses["present"],
+            "modified": total.statuses["added"] + total.statuses["updated"],
+            "bytes_read": total.counters["bytes_read"],
+            "bytes_written": total.counters["bytes_written"],
+            "phase_seconds": {phase: total.phase_ns[phase] / 1e9 for phase in PHASES},
+            "latency_ms": {
+                "p50": self._percentile(total.latencies, 0.50),
+                "p99": self._percentile(total.latencies, 0.99),
+            },
+        }
+
+    def write(self, stats_file: str):
+        """
+        Write the report as JSON
+        :param stats_file: The path to the JSON file
+        """
+        with open(stats_file, "w") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the helpers in the 'src.auto_license' module.
+
+Tested functionalities include:
+- Getting the same results from a parallel run and a serial run.
+- Summarizing the results of a run.
+- Building the managers of a run and selecting the manager of each file.
+- Selecting the files of a run from a list or a walk.
+- Answering requests in serve mode.
+"""
+import io
+import json
+from collections import Counter
+from unittest.mock import call, patch
+from src.auto_license import (
+    build_managers,
+    build_walker,
+    print_summary,
+    run_serve,
+    select_file_paths,
+)
+from src.file_walker import FileWalker
+from src.license_arg_config import LicenseArgConfig
+from src.license_manager import LicenseManager, LicenseStatus
+from src.license_pipeline import ordered_map
+
+
+def test_parallel_run_matches_serial_run(tmp_path):
+    """Test that processing a folder with several jobs gives the same result as one job."""
+    for folder in ["serial", "parallel"]:
+        (tmp_path / folder).mkdir()
+        for index in range(10):
+            (tmp_path / folder / f"file{index}.py").write_text(f"print({index})\n")
+        (tmp_path / folder / "notes.txt").write_text("notes\n")
+    manager = LicenseManager("MIT License\nCopyright 2015-2024 Microsoft Corporation")
+    walker = FileWalker(manager.classifier)
+
+    serial = list(
+        ordered_map(manager.process_file, walker.walk(str(tmp_path / "serial")), jobs=1)
+    )
+    parallel = list(
+        ordered_map(manager.process_file, walker.walk(str(tmp_path / "parallel")), jobs=4)
+    )
+
+    assert [result.status for result in parallel] == [result.status for result in serial]
+    assert [result.status for result in serial] == [LicenseStatus.ADDED] * 10
+    for index in range(10):
+        assert (tmp_path / "parallel" / f"file{index}.py").read_text() == (
+            tmp_path / "serial" / f"file{index}.py"
+        ).read_text()
+
+
+def test_print_summary():
+    """Test that the summary counts the files by status and the skipped files by reason."""
+    status_counts = Counter({LicenseStatus.ADDED: 2, LicenseStatus.SKIPPED: 3})
+    skip_counts = Counter({"generated": 1, "binary": 2})
+
+    with patch("builtins.print") as mock_print:
+        print_summary(status_counts, skip_counts)
+
+    assert mock_print.call_args_list == [
+        call("Summary: 5 files, 2 added, 3 skipped"),
+        call("Skipped: binary: 2, generated: 1"),
+    ]
+
+
+def make_config(tmp_path, **options) -> LicenseArgConfig:
+    """Create the configuration of a run on tmp_path, with the given options."""
+    config = LicenseArgConfig()
+    config.license_file = "data/license.json"
+    config.license_type = "MIT License"
+    config.start_year = 2020
+    config.author = "John Doe"
+    config.target_folder = str(tmp_path)
+    for name, value in options.items():
+        setattr(config, name, value)
+    return config
+
+
+def test_build_managers_selects_the_rule_manager(tmp_path):
+    """Test that files matching a rule get the manager of its license."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(
+        json.dumps({"rules": [{"paths": ["vendor/"], "license_type": "Apache License 2.0"}]})
+    )
+
+    managers = build_managers(make_config(tmp_path, rules=str(rules_file)))
+
+    vendored = managers.select(str(tmp_path / "vendor" / "a.py"))
+    assert vendored is managers.rule_managers[0]
+    assert vendored.license_text.startswith("Apache License")
+    assert managers.select(str(tmp_path / "src" / "a.py")) is managers.default
+    assert vendored.stats is managers.default.stats
+
+
+def test_select_file_paths(tmp_path):
+    """Test that listed files are filtered, and that the target folder is walked otherwise."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    config = make_config(tmp_path, paths=["b.py", "notes.txt", "c.js"])
+    walker = build_walker(config, build_managers(config).default.classifier)
+
+    assert list(select_file_paths(config, walker)) == ["b.py", "c.js"]
+    config.paths = []
+    assert list(select_file_paths(config, walker)) == [str(tmp_path / "a.py")]
+
+
+def test_run_serve_on_stdin(tmp_path):
+    """Test that serve mode answers the requests of the standard input."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+    config = make_config(tmp_path, serve=True)
+    request = {"jsonrpc": "2.0", "id": 1, "method": "check",
+               "params": {"paths": [str(tmp_path / "a.py")]}}
+    stdout = io.StringIO()
+
+    with patch("sys.stdin", io.StringIO(json.dumps(request) + "\n")), patch(
+        "sys.stdout", stdout
+    ):
+        assert run_serve(config, build_managers(config)) == 0
+
+    assert json.loads(stdout.getvalue())["result"][0]["status"] == "missing"
@@ -0,0 +1,70 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the 'src.file_list' module.
+
+Tested functionalities include:
+- Splitting a stream into items across chunk boundaries.
+- Reading newline- and NUL-separated lists of files.
+- Reading a list of files from a file or the standard input.
+"""
+import io
+import sys
+from unittest.mock import patch
+import pytest
+from src import file_list
+from src.file_list import open_file_list, read_file_list, split_stream
+
+
+def test_split_stream_across_chunks():
+    """Test that items cut by a chunk boundary are joined back."""
+    data = b"\0".join(f"folder/file{index}.py".encode() for index in range(100))
+    with patch.object(file_list, "READ_CHUNK_SIZE", 7):
+        items = list(split_stream(io.BytesIO(data), b"\0"))
+
+    assert items == [f"folder/file{index}.py".encode() for index in range(100)]
+
+
+def test_read_newline_separated_list():
+    """Test that newline-separated lists accept CRLF and skip blank lines."""
+    stream = io.BytesIO(b"a.py\r\n\nsub/b with space.js\nc.sh")
+
+    assert list(read_file_list(stream)) == ["a.py", "sub/b with space.js", "c.sh"]
+
+
+def test_read_null_separated_list():
+    """Test that NUL-separated lists keep newlines in file names."""
+    stream = io.BytesIO(b"a.py\0odd\nname.py\0")
+
+    assert list(read_file_list(stream, null_separated=True)) == ["a.py", "odd\nname.py"]
+
+
+def test_open_file_list(tmp_path):
+    """Test reading a list of files from a file and from the standard input."""
+    list_file = tmp_path / "files.txt"
+    list_file.write_bytes(b"a.py\nb.py\n")
+    assert list(open_file_list(str(list_file))) == ["a.py", "b.py"]
+
+    stdin = io.TextIOWrapper(io.BytesIO(b"c.py\0d.py"))
+    with patch.object(sys, "stdin", stdin):
+        assert list(open_file_list("-", null_separated=True)) == ["c.py", "d.py"]
+
+
+def test_open_missing_file_list(tmp_path):
+    """Test that a missing list of files is reported as an error."""
+    with patch("builtins.print") as mock_print, pytest.raises(SystemExit):
+        list(open_file_list(str(tmp_path / "missing.txt")))
+
+    assert mock_print.call_args[0][0].startswith("Error: Cannot read the list of files")
@@ -0,0 +1,83 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the FileWalker class.
+
+Tested functionalities include:
+- Walking the target folder in a deterministic order.
+- Pruning version control, dependency and configured folders.
+- Skipping unsupported files and files with skipped extensions.
+"""
+import os
+import pytest
+from src.file_walker import FileWalker
+
+
+def _relative(paths, root):
+    """Return the paths relative to the root folder."""
+    return [os.path.relpath(path, root) for path in paths]
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Fixture to create a small project tree."""
+    for name in [
+        "setup.py",
+        "README.txt",
+        "b/2.py",
+        "b/1.js",
+        "a/z.c",
+        ".git/hooks/pre-commit.sh",
+        "node_modules/lib/index.js",
+        "vendor/lib.py",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    return tmp_path
+
+
+def test_walk_sorted_and_pruned(project):
+    """Test that supported files are yielded in sorted order outside pruned folders."""
+    paths = FileWalker().walk(str(project))
+
+    assert _relative(paths, project) == [
+        "setup.py",
+        "a/z.c",
+        "b/1.js",
+        "b/2.py",
+        "vendor/lib.py",
+    ]
+
+
+def test_walk_configured_prune_and_skip(project):
+    """Test that the prune list and the skipped extensions can be configured."""
+    walker = FileWalker(prune_dirs={"vendor"}, skip_extensions=[".JS"])
+
+    assert _relative(walker.walk(str(project)), project) == [
+        "setup.py",
+        ".git/hooks/pre-commit.sh",
+        "a/z.c",
+        "b/2.py",
+    ]
+
+
+def test_walk_skips_symlinks(project):
+    """Test that symbolic links to files and folders are not followed."""
+    os.symlink(project / "setup.py", project / "link.py")
+    os.symlink(project / "a", project / "linked_folder")
+
+    assert "link.py" not in _relative(FileWalker().walk(str(project)), project)
+    assert "linked_folder/z.c" not in _relative(FileWalker().walk(str(project)), project)
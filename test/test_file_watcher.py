@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the FileWatcher class.
+
+Tested functionalities include:
+- Watching every folder entered by the initial walk.
+- Coalescing the events of a file into a single batch entry.
+- Watching new folders and taking the files they already hold.
+- Leaving out unsupported, ignored and pruned files.
+"""
+import os
+import sys
+import pytest
+from src.file_walker import FileWalker
+from src.file_watcher import FileWatcher
+from src.license_manager import LicenseManager
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is only available on Linux"
+)
+
+
+@pytest.fixture
+def watcher():
+    watcher = FileWatcher(FileWalker(), debounce=0.05)
+    yield watcher
+    watcher.close()
+
+
+def test_initial_walk_watches_folders(tmp_path, watcher):
+    """Test that the initial walk yields the files and watches the folders it enters."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("x = 1\n")
+    (tmp_path / "node_modules").mkdir()
+
+    assert list(watcher.walk(str(tmp_path))) == [str(tmp_path / "src" / "a.py")]
+    assert sorted(folder for folder, _ in watcher.folders.values()) == [
+        str(tmp_path),
+        str(tmp_path / "src"),
+    ]
+
+
+def test_events_are_coalesced(tmp_path, watcher):
+    """Test that a file written several times is reported once, and others are left out."""
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    list(watcher.walk(str(tmp_path)))
+
+    for _ in range(3):
+        (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    (tmp_path / "ignored.py").write_text("x = 1\n")
+    (tmp_path / "b.js").write_text("var b;\n")
+
+    batch = next(watcher.batches())
+
+    assert batch == [str(tmp_path / "a.py"), str(tmp_path / "b.js")]
+
+
+def test_new_folders_are_watched(tmp_path, watcher):
+    """Test that a new folder is watched and the files it already holds are reported."""
+    list(watcher.walk(str(tmp_path)))
+
+    staging = tmp_path.parent / f"{tmp_path.name}-staging"
+    staging.mkdir()
+    (staging / "moved.py").write_text("x = 1\n")
+    os.rename(staging, tmp_path / "pkg")
+    batches = watcher.batches()
+    assert next(batches) == [str(tmp_path / "pkg" / "moved.py")]
+
+    (tmp_path / "pkg" / "later.py").write_text("x = 2\n")
+    assert next(batches) == [str(tmp_path / "pkg" / "later.py")]
+
+
+def test_own_writes_are_ignored(tmp_path, watcher):
+    """Test that the files we modified are not reported again, unless touched since."""
+    manager = LicenseManager("MIT License")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 2\n")
+    list(watcher.track(manager.process_many(watcher.walk(str(tmp_path)))))
+    # Touched by someone else after our write
+    with open(tmp_path / "b.py", "a") as f:
+        f.write("y = 3\n")
+
+    assert next(watcher.batches()) == [str(tmp_path / "b.py")]
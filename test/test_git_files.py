@@ -0,0 +1,93 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the 'src.git_files' module.
+
+Tested functionalities include:
+- Listing the files changed since a reference, staged or tracked in a git repository.
+- Limiting the list to the target folder and leaving deleted files out.
+- Exiting with an error when git fails.
+"""
+import os
+import shutil
+import subprocess
+import pytest
+from src.git_files import list_git_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repository, *args):
+    """Run a git command in the repository."""
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repository,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture to create a git repository with one commit and some local changes."""
+    for name in ["main.py", "src/app.py", "src/old.py", "src/util.c"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+
+    (tmp_path / "src" / "app.py").write_text("changed\n")
+    (tmp_path / "src" / "new.py").write_text("")
+    (tmp_path / "src" / "old.py").unlink()
+    _git(tmp_path, "add", "-A", "src/new.py", "src/old.py")
+    return tmp_path
+
+
+def _names(paths, root):
+    """Return the paths relative to the root folder."""
+    return sorted(os.path.relpath(path, root) for path in paths)
+
+
+def test_list_files_since_reference(repository):
+    """Test that files changed since a reference, staged or not, are listed."""
+    assert _names(list_git_files(str(repository), since="HEAD"), repository) == [
+        "src/app.py",
+        "src/new.py",
+    ]
+
+
+def test_list_staged_files(repository):
+    """Test that only staged files are listed."""
+    assert _names(list_git_files(str(repository), staged=True), repository) == [
+        "src/new.py"
+    ]
+
+
+def test_list_tracked_files_in_sub_folder(repository):
+    """Test that tracked files are listed for the target folder only."""
+    folder = repository / "src"
+    assert _names(list_git_files(str(folder), tracked_only=True), repository) == [
+        "src/app.py",
+        "src/new.py",
+        "src/util.c",
+    ]
+
+
+def test_unknown_reference_exits(repository):
+    """Test that an unknown reference prints an error and exits."""
+    with pytest.raises(SystemExit):
+        list(list_git_files(str(repository), since="no-such-branch"))
@@ -0,0 +1,89 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the IgnoreRules and IgnoreMatcher classes.
+
+Tested functionalities include:
+- Translating .gitignore patterns (anchored, unanchored, '**', character classes).
+- Negated rules and folder-only rules, the last matching rule deciding.
+- Nested ignore files and .licenseignore files while walking a tree.
+"""
+import os
+import pytest
+from src.file_walker import FileWalker
+from src.ignore_matcher import IgnoreRules
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.py", "main.py", False, True),
+        ("*.py", "src/deep/main.py", False, True),
+        ("/main.py", "src/main.py", False, None),
+        ("src/*.py", "src/main.py", False, True),
+        ("src/*.py", "src/deep/main.py", False, None),
+        ("docs/**/*.md", "docs/a/b/index.md", False, True),
+        ("docs/**/*.md", "docs/index.md", False, True),
+        ("**/generated", "a/b/generated", True, True),
+        ("vendor/**", "vendor/lib/a.c", False, True),
+        ("build/", "build", True, True),
+        ("build/", "build", False, None),
+        ("file[0-9].c", "file3.c", False, True),
+        ("file[!0-9].c", "file3.c", False, None),
+        ("?.c", "a.c", False, True),
+        ("\\#notes.md", "#notes.md", False, True),
+        ("# comment", "# comment", False, None),
+    ],
+)
+def test_translate_patterns(pattern, path, is_dir, expected):
+    """Test that single .gitignore patterns match the expected paths."""
+    assert IgnoreRules([pattern]).match(path, is_dir) is expected
+
+
+def test_last_matching_rule_decides():
+    """Test that a later negated rule re-includes a path, and a later rule wins again."""
+    rules = IgnoreRules(["*.js", "!keep.js", "keep.js"])
+    assert rules.match("keep.js", False) is True
+
+    rules = IgnoreRules(["*.js", "!keep.js"])
+    assert rules.match("keep.js", False) is False
+    assert rules.match("drop.js", False) is True
+    assert rules.match("main.py", False) is None
+
+
+def test_walk_honours_nested_ignore_files(tmp_path):
+    """Test that the walker prunes ignored folders and files at every level."""
+    for name in [
+        "main.py",
+        "generated/out.py",
+        "src/app.js",
+        "src/app.min.js",
+        "src/keep.min.js",
+        "src/third_party/lib.c",
+        "docs/index.md",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    (tmp_path / ".gitignore").write_text("generated/\n*.min.js\n")
+    (tmp_path / "src" / ".gitignore").write_text("!keep.min.js\n/third_party\n")
+    (tmp_path / ".licenseignore").write_text("docs\n")
+
+    paths = [os.path.relpath(path, tmp_path) for path in FileWalker().walk(str(tmp_path))]
+    assert paths == ["main.py", "src/app.js", "src/keep.min.js"]
+    assert len(list(FileWalker().walk(str(tmp_path) + os.sep))) == 3
+
+    walker = FileWalker(ignore_file_names=())
+    assert len(list(walker.walk(str(tmp_path) + os.sep))) == 7
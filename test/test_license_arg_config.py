@@ -30,6 +30,20 @@ import pytest
 from unittest.mock import MagicMock, patch
 from src.license_arg_config import LicenseArgConfig
 
+# The options left at their defaults by the tests below
+DEFAULT_OPTIONS = dict(
+    paths=[],
+    files_from=None,
+    since=None,
+    staged=False,
+    tracked_only=False,
+    rules=None,
+    watch=False,
+    serve=False,
+    socket=None,
+    journal=None,
+)
+
 
 @pytest.fixture
 def config_instance():
@@ -43,6 +57,7 @@ def config_instance():
 def test_parse_valid_args(mock_parse_args, mock_exit, config_instance):
     """Test that valid command-line arguments are parsed correctly."""
     mock_parse_args.return_value = MagicMock(
+        **DEFAULT_OPTIONS,
         license_file="license.json",
         license_type="MIT License",
         start_year=2020,
@@ -76,6 +91,7 @@ def test_invalid_start_year_greater_than_end_year(
     mock_access.return_value = True
 
     mock_parse_args.return_value = MagicMock(
+        **DEFAULT_OPTIONS,
         license_file="license.json",
         license_type="MIT License",
         start_year=current_year + 1,  # Start year is current year + 1
@@ -102,6 +118,7 @@ def test_end_year_in_future(
 ):
     """Test that an error is raised when the end year is in the future."""
     mock_parse_args.return_value = MagicMock(
+        **DEFAULT_OPTIONS,
         license_file="license.json",
         license_type="MIT License",
         start_year=2020,
@@ -120,4 +137,88 @@ def test_end_year_in_future(
         )
 
 
+# Test that check mode does not need a writable target folder
+@patch("sys.exit")
+@patch("argparse.ArgumentParser.parse_args")
+@patch("os.path.isdir")
+@patch("os.access")
+def test_check_mode_read_only_target_folder(
+    mock_access, mock_isdir, mock_parse_args, mock_exit, config_instance
+):
+    """Test that a read-only target folder is accepted in check mode only."""
+    mock_isdir.return_value = True
+    mock_access.return_value = False
+
+    mock_parse_args.return_value = MagicMock(
+        **DEFAULT_OPTIONS,
+        license_file="license.json",
+        license_type="MIT License",
+        start_year=2020,
+        author="John Doe",
+        end_year=2024,
+        target_folder="./output",
+        check=True,
+    )
+    config_instance.parse()
+    mock_exit.assert_not_called()
+    assert config_instance.check
+
+    mock_parse_args.return_value.check = False
+    config_instance.parse()
+    mock_exit.assert_called_once_with(1)
+
+
+@patch("sys.exit")
+@patch("sys.argv", ["main.py", "--license-file=license.json", "--license-type=MIT License",
+                    "--start-year=2020", "--author=John Doe", "a.py", "b.py"])
+def test_files_without_target_folder(mock_exit, config_instance):
+    """Test that the target folder is optional when the files are listed explicitly."""
+    config_instance.parse()
+
+    mock_exit.assert_not_called()
+    assert config_instance.target_folder is None
+    assert config_instance.paths == ["a.py", "b.py"]
+
+
+@patch("sys.exit")
+@patch("sys.argv", ["main.py", "--license-file=license.json", "--license-type=MIT License",
+                    "--start-year=2020", "--author=John Doe"])
+def test_no_target_folder_and_no_files(mock_exit, config_instance):
+    """Test that an error is raised when neither a target folder nor files are given."""
+    with patch("builtins.print") as mock_print:
+        config_instance.parse()
+
+    mock_print.assert_called_with("Error: A target folder or a list of files must be given.")
+    mock_exit.assert_called_once_with(1)
+
+
+@patch("sys.argv", ["main.py", "--license-file=license.json", "--license-type=MIT License",
+                    "--start-year=2020", "--author=John Doe", "a.py", "--check",
+                    "--update-years"])
+def test_check_and_update_years_are_exclusive(config_instance):
+    """Test that --check and --update-years cannot be given together."""
+    with pytest.raises(SystemExit):
+        config_instance.parse()
+
+
+@patch("sys.exit")
+@patch("sys.argv", ["main.py", "--license-file=license.json", "--license-type=MIT License",
+                    "--start-year=2020", "--author=John Doe", "a.py", "--socket=x.sock"])
+def test_socket_without_serve(mock_exit, config_instance):
+    """Test that --socket is rejected without --serve."""
+    with patch("builtins.print") as mock_print:
+        config_instance.parse()
+
+    mock_print.assert_called_with("Error: --socket can only be used with --serve.")
+    mock_exit.assert_called_once_with(1)
+
+
+@patch("sys.argv", ["main.py", "--license-file=license.json", "--license-type=MIT License",
+                    "--start-year=2020", "--author=John Doe", "a.py", "--max-size=-1"])
+def test_negative_max_size(config_instance):
+    """Test that a negative --max-size is rejected instead of skipping every file."""
+    with pytest.raises(SystemExit):
+        config_instance.parse()
+
+
 # Remove unused imports and parameters
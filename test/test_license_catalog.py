@@ -0,0 +1,112 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseCatalog class.
+
+Tested functionalities include:
+- Parsing a license file once per process while it is unchanged.
+- Parsing it again when it changes.
+- Reusing the on-disk cache across processes, and ignoring a stale one.
+"""
+import json
+import os
+from unittest.mock import patch
+import pytest
+from src.license_catalog import LicenseCatalog
+from src.license_generator import LicenseGenerator
+
+LICENSES = {
+    "licenses": {
+        "MIT License": {
+            "copyright": ["Copyright {start_year}-{end_year} {author}."],
+            "permissions": ["Permission is granted."],
+            "conditions": ["Keep this notice."],
+        }
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty in-process cache."""
+    LicenseCatalog.clear_cache()
+    yield
+    LicenseCatalog.clear_cache()
+
+
+@pytest.fixture
+def license_file(tmp_path):
+    path = tmp_path / "license.json"
+    path.write_text(json.dumps(LICENSES))
+    return path
+
+
+def test_parsed_once_per_process(license_file):
+    """Test that creating many generators parses the license file only once."""
+    with patch("src.license_catalog.json.load", wraps=json.load) as mock_load:
+        for _ in range(5):
+            LicenseGenerator(str(license_file), "MIT License", 2015, 2024, "John Wick")
+
+    assert mock_load.call_count == 1
+
+
+def test_parsed_again_when_changed(license_file):
+    """Test that a changed license file is parsed again."""
+    catalog = LicenseCatalog.load(str(license_file))
+    assert list(catalog.licenses) == ["MIT License"]
+
+    data = json.loads(json.dumps(LICENSES))
+    data["licenses"]["Apache License 2.0"] = data["licenses"]["MIT License"]
+    license_file.write_text(json.dumps(data))
+    os.utime(license_file, ns=(0, 0))
+
+    catalog = LicenseCatalog.load(str(license_file))
+    assert catalog.get("Apache License 2.0") is not None
+
+
+def test_disk_cache(tmp_path, license_file):
+    """Test that the on-disk cache is used by a new process while the file is unchanged."""
+    cache_file = tmp_path / "catalog.cache"
+    LicenseCatalog.load(str(license_file), str(cache_file))
+    # Plain data only, never anything that could run code when loaded
+    assert json.loads(cache_file.read_text())["licenses"] == LICENSES["licenses"]
+
+    # A new process starts with an empty in-process cache
+    LicenseCatalog.clear_cache()
+    with patch.object(LicenseCatalog, "parse") as mock_parse:
+        catalog = LicenseCatalog.load(str(license_file), str(cache_file))
+
+    mock_parse.assert_not_called()
+    assert catalog.get("MIT License") == LICENSES["licenses"]["MIT License"]
+
+
+def test_stale_or_corrupt_disk_cache(tmp_path, license_file):
+    """Test that a stale or corrupt cache is ignored and rewritten."""
+    cache_file = tmp_path / "catalog.cache"
+    cache_file.write_bytes(b"not json")
+
+    catalog = LicenseCatalog.load(str(license_file), str(cache_file))
+    assert catalog.get("MIT License") is not None
+
+    LicenseCatalog.clear_cache()
+    license_file.write_text(json.dumps({"licenses": {}}))
+    catalog = LicenseCatalog.load(str(license_file), str(cache_file))
+    assert catalog.licenses == {}
+
+
+def test_missing_file_is_not_cached(tmp_path):
+    """Test that a missing license file raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        LicenseCatalog.load(str(tmp_path / "missing.json"))
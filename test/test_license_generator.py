@@ -172,5 +172,23 @@ def test_invalid_license_type(license_data):
             license_generator.generate_license()
 
 
+def test_copyright_pattern(license_data):
+    """Test that the copyright pattern matches the generated line for any year range"""
+    with patch("builtins.open", mock_open(read_data=json.dumps(license_data))):
+        license_generator = LicenseGenerator(
+            license_file="license.json",
+            license_type="MIT License",
+            start_year=2015,
+            end_year=2024,
+            author="Microsoft Corporation",
+        )
+        pattern = license_generator.copyright_pattern()
+
+        match = pattern.search(b"# Copyright 2010-2019 Microsoft Corporation.\n")
+        assert match.group("start_year") == b"2010"
+        assert match.group("end_year") == b"2019"
+        assert pattern.search(b"# Copyright 2010-2019 Someone Else.\n") is None
+
+
 if __name__ == "__main__":
     pytest.main()
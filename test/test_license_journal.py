@@ -0,0 +1,121 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseJournal class.
+
+Tested functionalities include:
+- Resuming with the entries journaled by an interrupted run.
+- Dropping a torn last line, and starting over for another configuration.
+- Not recording failed files, so that they are retried.
+- Resuming an interrupted auto_license run without processing the journaled files again.
+"""
+from unittest.mock import patch
+from src.auto_license import auto_license
+from src.license_journal import LicenseJournal
+from src.license_manager import LicenseResult, LicenseStatus
+
+
+def test_journal_resumes_entries(tmp_path):
+    """Test that the entries of an interrupted run are loaded back."""
+    journal_file = str(tmp_path / "run.journal")
+    journal = LicenseJournal(journal_file, "config")
+    for result in journal.track([
+        LicenseResult("a.py", LicenseStatus.ADDED, ""),
+        LicenseResult("b.py", LicenseStatus.SKIPPED, "", "binary"),
+        LicenseResult("c.py", LicenseStatus.ERROR, "Permission denied"),
+    ]):
+        pass
+    journal.close()
+
+    resumed = LicenseJournal(journal_file, "config")
+    assert resumed.result("a.py").status is LicenseStatus.ADDED
+    assert resumed.result("b.py")[:2] == ("b.py", LicenseStatus.SKIPPED)
+    assert resumed.result("b.py").reason == "binary"
+    # Failed files are retried
+    assert resumed.result("c.py") is None
+    resumed.remove()
+    assert not (tmp_path / "run.journal").exists()
+
+
+def test_journal_drops_torn_line(tmp_path):
+    """Test that a line cut by a crash is dropped, and the next entries appended after it."""
+    journal_file = tmp_path / "run.journal"
+    journal = LicenseJournal(str(journal_file), "config")
+    journal.record(LicenseResult("a.py", LicenseStatus.ADDED, ""))
+    journal.close()
+    with open(journal_file, "ab") as f:
+        f.write(b'["b.py", "ad')
+
+    resumed = LicenseJournal(str(journal_file), "config")
+    assert list(resumed.entries) == ["a.py"]
+    resumed.record(LicenseResult("c.py", LicenseStatus.PRESENT, ""))
+    resumed.close()
+
+    assert set(LicenseJournal(str(journal_file), "config").entries) == {"a.py", "c.py"}
+
+
+def test_journal_of_another_config_is_started_over(tmp_path):
+    """Test that a journal written with another configuration is discarded."""
+    journal_file = str(tmp_path / "run.journal")
+    journal = LicenseJournal(journal_file, "config")
+    journal.record(LicenseResult("a.py", LicenseStatus.ADDED, ""))
+    journal.close()
+
+    assert LicenseJournal(journal_file, "new config").entries == {}
+
+
+def test_journal_syncs_in_batches(tmp_path):
+    """Test that the journal is only synced once a batch of entries is complete."""
+    journal = LicenseJournal(str(tmp_path / "run.journal"), "config", 3, 3600)
+    with patch("os.fsync") as mock_fsync:
+        for name in ("a.py", "b.py", "c.py", "d.py"):
+            journal.record(LicenseResult(name, LicenseStatus.ADDED, ""))
+    assert mock_fsync.call_count == 1
+    journal.close()
+
+
+def test_auto_license_resumes_from_journal(tmp_path):
+    """Test that an interrupted run resumes without processing the journaled files again."""
+    target = tmp_path / "project"
+    target.mkdir()
+    for name in ("a.py", "b.py"):
+        (target / name).write_text("x = 1\n")
+    journal_file = tmp_path / "run.journal"
+    argv = [
+        "main.py", "--license-file=data/license.json", "--license-type=MIT License",
+        "--start-year=2024", "--author=John Doe", f"--target-folder={target}",
+        "--jobs=1", f"--journal={journal_file}",
+    ]
+
+    with patch("sys.argv", argv), patch(
+        "src.license_manager.LicenseManager.process_file",
+        autospec=True,
+        side_effect=[LicenseResult(str(target / "a.py"), LicenseStatus.ADDED, ""),
+                     KeyboardInterrupt],
+    ):
+        try:
+            auto_license()
+        except KeyboardInterrupt:
+            pass
+    assert journal_file.exists()
+
+    with patch("sys.argv", argv), patch(
+        "src.license_manager.LicenseManager.process_file",
+        autospec=True,
+        side_effect=lambda manager, path: LicenseResult(path, LicenseStatus.ADDED, ""),
+    ) as mock_process:
+        assert auto_license() == 0
+    assert [call.args[1] for call in mock_process.call_args_list] == [str(target / "b.py")]
+    assert not journal_file.exists()
@@ -29,9 +29,23 @@ Tested functionalities include:
 Modules tested:
 - `LicenseManager`
 """
-from unittest.mock import mock_open, patch
+import codecs
+import errno
+import os
+import re
+from datetime import datetime
+from unittest.mock import patch
 import pytest
-from src.license_manager import CommentStyle, FileType, LicenseManager
+from src.license_manager import (
+    GENERATED_MARKERS,
+    MAX_HEADER_SIZE,
+    CommentStyle,
+    FileType,
+    FileTypeClassifier,
+    LicenseKeywordMatcher,
+    LicenseManager,
+    LicenseStatus,
+)
 
 
 @pytest.fixture
@@ -62,53 +76,105 @@ def test_check_and_add_license_file_not_exist(mock_exists, license_manager):
         )
 
 
-@patch("os.path.exists")
-@patch(
-    "builtins.open",
-    new_callable=mock_open,
-    read_data="MIT License\nCopyright 2015-2024 Microsoft Corporation",
-)
-def test_check_and_add_license_already_exists(mock_file, mock_exists, license_manager):
+def test_check_and_add_license_already_exists(tmp_path, license_manager):
     """
     Test that ensures the license manager handles the case when a file
     already contains a license. It checks that the correct info message is printed
     when the license is successfully added to the file.
     """
-    # Simulate that the file exists and already contains a license
-    mock_exists.return_value = True
+    # The file contains the license text, but not inside a comment block
+    file_path = tmp_path / "existing_license.py"
+    file_path.write_text("MIT License\nCopyright 2015-2024 Microsoft Corporation")
 
-    # Simulate that the file already contains a license
     with patch("builtins.print") as mock_print:
-        license_manager.check_and_add_license("test/testfile/existing_license.py")
+        license_manager.check_and_add_license(str(file_path))
         mock_print.assert_called_with(
-            "[INFO] License added successfully to test/testfile/existing_license.py."
+            f"[INFO] License added successfully to {file_path}."
         )
 
 
-@patch("os.path.exists")
-@patch("builtins.open", new_callable=mock_open, read_data="This is a test file.\n")
-def test_check_and_add_license_html_comment(mock_file, mock_exists, license_manager):
+def test_check_and_add_license_html_comment(tmp_path, license_manager):
     """
     Test that verifies the correct license is added to an HTML file using HTML-style comments.
     It checks if the license is correctly formatted and added at the beginning of the file.
     """
-    # Simulate that the file exists, but does not contain a license
-    mock_exists.return_value = True
+    # The file exists, but does not contain a license
+    file_path = tmp_path / "test.html"
+    file_path.write_text("This is a test file.\n")
 
     # Test an .html file, which should use HTML comments
     with patch("builtins.print") as mock_print:
-        license_manager.check_and_add_license("test/testfile/test.html")
+        license_manager.check_and_add_license(str(file_path))
 
         # Check that the license was added successfully
         mock_print.assert_called_with(
-            "[INFO] License added successfully to test/testfile/test.html."
+            f"[INFO] License added successfully to {file_path}."
         )
 
-        # Check if the written license adheres to HTML comment format
-        handle = mock_file()
-        written_data = handle.write.call_args[0][0]
-        assert written_data.startswith("<!--")  # HTML comments should start with '<!--'
-        assert written_data.endswith("\n")  # HTML comments should end with '-->'
+    # Check if the written license adheres to HTML comment format
+    written_data = file_path.read_text()
+    assert written_data.startswith("<!--")  # HTML comments should start with '<!--'
+    assert written_data.endswith("-->\nThis is a test file.\n")  # Original content follows
+
+
+def test_write_license_header_keeps_mode_and_content(tmp_path, license_manager):
+    """
+    Test that inserting a header streams the original content behind it, keeps the
+    file mode and leaves no temporary file behind.
+    """
+    file_path = tmp_path / "run.sh"
+    body = b"echo hello\n" * 300_000
+    file_path.write_bytes(body)
+    file_path.chmod(0o751)
+
+    license_manager.write_license_header(str(file_path), b"# header\n")
+
+    assert file_path.read_bytes() == b"# header\n" + body
+    assert file_path.stat().st_mode & 0o777 == 0o751
+    assert [p.name for p in tmp_path.iterdir()] == ["run.sh"]
+
+
+def test_write_license_header_falls_back_to_chunked_copy(tmp_path, license_manager):
+    """Test that the body is still copied when the kernel cannot copy between the files."""
+    file_path = tmp_path / "test.py"
+    file_path.write_bytes(b"print('hello')\n")
+
+    unsupported = OSError(errno.EXDEV, "Invalid cross-device link")
+    with patch("os.copy_file_range", side_effect=unsupported, create=True), patch(
+        "os.sendfile", side_effect=unsupported, create=True
+    ):
+        license_manager.write_license_header(str(file_path), b"# header\n")
+
+    assert file_path.read_bytes() == b"# header\nprint('hello')\n"
+
+
+def test_write_license_header_failure_keeps_original(tmp_path, license_manager):
+    """Test that a failure while copying leaves the original file and no temporary file."""
+    file_path = tmp_path / "test.py"
+    file_path.write_bytes(b"print('hello')\n")
+
+    with patch.object(LicenseManager, "_copy_body", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            license_manager.write_license_header(str(file_path), b"# header\n")
+
+    assert file_path.read_bytes() == b"print('hello')\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["test.py"]
+
+
+def test_write_license_header_through_symlink(tmp_path, license_manager):
+    """Test that the header is written to the target of a link, and the link is kept."""
+    target = tmp_path / "real.py"
+    target.write_bytes(b"print('hello')\n")
+    (tmp_path / "sub").mkdir()
+    link = tmp_path / "sub" / "link.py"
+    link.symlink_to(os.path.join("..", "real.py"))
+
+    assert license_manager.process_file(str(link)).status is LicenseStatus.ADDED
+
+    assert link.is_symlink()
+    assert target.read_bytes().endswith(b"\nprint('hello')\n")
+    assert target.read_bytes() != b"print('hello')\n"
+    assert sorted(p.name for p in (tmp_path / "sub").iterdir()) == ["link.py"]
 
 
 def test_is_license_present(license_manager):
@@ -174,3 +240,388 @@ def test_format_license_with_comments(license_manager):
     )
     assert formatted.startswith("<!--")
     assert formatted.endswith("-->")
+
+
+def test_header_detection_reads_bounded_prefix(tmp_path, license_manager):
+    """
+    Test that header detection only reads a bounded prefix of the file, even when the
+    file is a single enormous line, and still finds a license at the top of a large file.
+    """
+    minified = tmp_path / "bundle.js"
+    minified.write_text("var a=1;" * 500_000)
+    with open(minified, "r") as file:
+        lines = list(license_manager.iter_header_lines(file))
+        assert sum(len(line) for line in lines) <= MAX_HEADER_SIZE
+        assert file.tell() < 2 * MAX_HEADER_SIZE
+
+    generated = tmp_path / "generated.py"
+    generated.write_text("# MIT License\n" + "x = 1\n" * 500_000)
+    with open(generated, "r") as file:
+        assert license_manager.is_license_in_lines(
+            license_manager.iter_header_lines(file), FileType.PYTHON
+        )
+        assert file.tell() < 2 * MAX_HEADER_SIZE
+
+
+def test_headers_rendered_once_per_comment_style(tmp_path, license_manager):
+    """
+    Test that the headers of every comment style are rendered up front, and that
+    processing files only reuses them, both for insertion and for detection.
+    """
+    assert set(license_manager.headers) == set(CommentStyle)
+    assert license_manager.headers[CommentStyle.MULTI_LINE] == (
+        license_manager.format_license_with_comments(CommentStyle.MULTI_LINE.value) + "\n"
+    ).encode("utf-8")
+
+    file_path = tmp_path / "test.c"
+    file_path.write_text("int main(void) { return 0; }\n")
+    with patch.object(LicenseManager, "format_license_with_comments") as mock_format:
+        license_manager.check_and_add_license(str(file_path))
+        with patch.object(LicenseManager, "is_license_in_lines") as mock_scan:
+            license_manager.check_and_add_license(str(file_path))
+            mock_scan.assert_not_called()  # exact match of the cached header
+        mock_format.assert_not_called()
+
+    assert file_path.read_bytes().startswith(license_manager.headers[CommentStyle.MULTI_LINE])
+
+
+def test_file_type_classifier():
+    """
+    Test that the classifier matches extensions case-insensitively, prefers the
+    longest suffix, matches exact file names and ignores hidden file names.
+    """
+    classifier = FileTypeClassifier()
+
+    assert classifier.classify("src/analysis.R") == FileType.R
+    assert classifier.classify("deploy/values.YAML") == FileType.YAML_LONG
+    assert classifier.classify("types/index.d.ts") == FileType.TYPESCRIPT_DECLARATION
+    assert classifier.classify("src/index.ts") == FileType.TYPESCRIPT
+    assert classifier.classify("archive.tar.py") == FileType.PYTHON
+    assert classifier.classify("Makefile") == FileType.MAKEFILE
+    assert classifier.classify("docker/Dockerfile") == FileType.DOCKERFILE
+    assert classifier.classify("config/.yml") is None
+    assert classifier.classify("README") is None
+    assert classifier.classify("notes.txt") is None
+
+
+def test_keyword_matcher():
+    """
+    Test that the keyword matcher finds the default keywords, including the current
+    year taken when the matcher is built, and any configured extra keyword.
+    """
+    matcher = LicenseKeywordMatcher()
+    assert matcher.search("# Copyright Wick Dynex")
+    assert matcher.search(f"# (c) {datetime.now().year} Wick Dynex")
+    assert not matcher.search("# Some random comment")
+
+    matcher = LicenseKeywordMatcher(
+        LicenseKeywordMatcher.default_keywords() + ["SPDX-License-Identifier:", "Wick Dynex"]
+    )
+    assert matcher.search("// (c) Wick Dynex")
+    assert not matcher.search("// Wick (c)")
+
+
+def test_is_license_present_with_configured_keywords():
+    """Test that the LicenseManager recognizes a header with a configured keyword only."""
+    manager = LicenseManager(
+        "MIT License", keyword_matcher=LicenseKeywordMatcher(["SPDX-License-Identifier:"])
+    )
+    content = "/*\n * SPDX-License-Identifier: MIT\n */\nint main(void);\n"
+
+    assert manager.is_license_present(content, FileType.C)
+    assert not manager.is_license_present("/*\n * Copyright 2024\n */\n", FileType.C)
+
+
+def _year_manager(end_year):
+    """Create a LicenseManager that updates the copyright years of the MIT License."""
+    return LicenseManager(
+        "MIT License\nCopyright (c) 2020 - 2024 Wick Dynex",
+        copyright_pattern=re.compile(
+            rb"Copyright \(c\) (?P<start_year>\d{4}) - (?P<end_year>\d{4}) Wick Dynex"
+        ),
+        end_year=end_year,
+    )
+
+
+def test_update_years_in_place(tmp_path):
+    """Test that only the end year is rewritten, in place, and the rest is kept as is."""
+    file_path = tmp_path / "test.py"
+    original = b"# MIT License\r\n# Copyright (c) 2020 - 2024 Wick Dynex\r\nprint(1)\r\n"
+    file_path.write_bytes(original)
+    inode = file_path.stat().st_ino
+
+    result = _year_manager(2026).update_years(str(file_path))
+
+    assert result.status is LicenseStatus.UPDATED
+    assert file_path.read_bytes() == original.replace(b"2024 Wick", b"2026 Wick")
+    assert file_path.stat().st_ino == inode  # patched, not replaced
+    assert _year_manager(2026).update_years(str(file_path)).status is LicenseStatus.PRESENT
+
+
+def test_update_years_up_to_date_is_read_only(tmp_path):
+    """Test that a file whose years are up to date is never opened for writing."""
+    file_path = tmp_path / "test.py"
+    file_path.write_bytes(b"# MIT License\n# Copyright (c) 2020 - 2026 Wick Dynex\nprint(1)\n")
+
+    with patch("builtins.open", wraps=open) as mock_open:
+        result = _year_manager(2026).update_years(str(file_path))
+
+    assert result.status is LicenseStatus.PRESENT
+    assert [call.args[1] for call in mock_open.call_args_list] == ["rb"]
+
+
+def test_update_years_with_different_length(tmp_path):
+    """Test that a year span of another length is rewritten through a temporary file."""
+    file_path = tmp_path / "test.c"
+    file_path.write_bytes(b"/*\n * Copyright (c) 2020 - 2024 Wick Dynex\n */\nint a;\n")
+
+    result = _year_manager(12026).update_years(str(file_path))
+
+    assert result.status is LicenseStatus.UPDATED
+    assert file_path.read_bytes() == (
+        b"/*\n * Copyright (c) 2020 - 12026 Wick Dynex\n */\nint a;\n"
+    )
+
+
+def test_update_years_without_copyright_line(tmp_path):
+    """Test that files without the copyright line of the template are left untouched."""
+    file_path = tmp_path / "test.py"
+    file_path.write_bytes(b"# Copyright (c) 2020 - 2024 Someone Else\n")
+
+    result = _year_manager(2026).update_years(str(file_path))
+
+    assert result.status is LicenseStatus.SKIPPED
+    assert file_path.read_bytes() == b"# Copyright (c) 2020 - 2024 Someone Else\n"
+
+
+def test_update_years_without_end_year(tmp_path):
+    """Test that a license without an end year is reported as such, not as missing."""
+    file_path = tmp_path / "test.py"
+    file_path.write_bytes(b"# Copyright (C) 2020 Wick Dynex\n")
+    manager = LicenseManager(
+        "Copyright (C) 2020 Wick Dynex",
+        copyright_pattern=re.compile(rb"Copyright \(C\) (?P<start_year>\d{4}) Wick Dynex"),
+        end_year=2026,
+    )
+
+    result = manager.update_years(str(file_path))
+
+    assert result.status is LicenseStatus.SKIPPED
+    assert result.reason == "no-end-year"
+    assert file_path.read_bytes() == b"# Copyright (C) 2020 Wick Dynex\n"
+
+
+def test_check_license_is_read_only(tmp_path):
+    """
+    Test that check mode reports missing and out of date licenses without opening
+    any file for writing.
+    """
+    manager = _year_manager(2024)
+    up_to_date = tmp_path / "up_to_date.py"
+    up_to_date.write_bytes(manager.headers[CommentStyle.SINGLE_LINE] + b"print(1)\n")
+    stale = tmp_path / "stale.py"
+    stale.write_bytes(b"# Copyright (c) 2020 - 2023 Wick Dynex\nprint(1)\n")
+    missing = tmp_path / "missing.py"
+    missing.write_bytes(b"print(1)\n" * 100_000)
+    empty = tmp_path / "empty.py"
+    empty.write_bytes(b"")
+
+    real_open = open
+
+    def read_only_open(file, mode="r", *args, **kwargs):
+        assert set(mode) <= {"r", "b", "t"}, f"{file} opened with mode {mode}"
+        return real_open(file, mode, *args, **kwargs)
+
+    with patch("builtins.open", side_effect=read_only_open):
+        statuses = {
+            path.name: manager.check_license(str(path)).status
+            for path in (up_to_date, stale, missing, empty)
+        }
+
+    assert statuses == {
+        "up_to_date.py": LicenseStatus.PRESENT,
+        "stale.py": LicenseStatus.STALE,
+        "missing.py": LicenseStatus.MISSING,
+        "empty.py": LicenseStatus.MISSING,
+    }
+    assert stale.read_bytes() == b"# Copyright (c) 2020 - 2023 Wick Dynex\nprint(1)\n"
+
+
+def test_sniff_skips_binary_generated_and_oversize_files(tmp_path):
+    """
+    Test that binary, generated and oversize files are skipped with their reason
+    before anything is decoded, and that undecodable text does not raise.
+    """
+    manager = LicenseManager("MIT License", max_file_size=1024)
+    files = {
+        "binary.js": b"var a = 1;\0\0\0",
+        "generated.py": b"# Code generated by protoc. DO NOT EDIT.\nx = 1\n",
+        "oversize.c": b"int a;\n" * 1000,
+        "latin1.py": "# café\nx = 1\n".encode("latin-1"),
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_bytes(content)
+
+    results = {name: manager.process_file(str(tmp_path / name)) for name in files}
+
+    assert [results[name].reason for name in files] == ["binary", "generated", "oversize", ""]
+    assert results["latin1.py"].status is LicenseStatus.ADDED
+    for name in ["binary.js", "generated.py", "oversize.c"]:
+        assert results[name].status is LicenseStatus.SKIPPED
+        assert (tmp_path / name).read_bytes() == files[name]
+
+
+@pytest.mark.parametrize(
+    "content, generated",
+    [
+        (b"#!/bin/sh\n# @generated by make\necho 1\n", True),
+        (b"/*\n * Autogenerated file.\n */\nint a;\n", True),
+        (b"/*\n Code generated by protoc.\n */\nint a;\n", True),
+        (b'<?xml version="1.0"?>\n<!-- DO NOT EDIT -->\n<a/>\n', True),
+        (b"import os\n# do not edit the table below\nTABLE = {}\n", False),
+        (b"autogenerated_ids = []\n", False),
+        (b"/* Helpers */\nint autogenerated;\n", False),
+    ],
+)
+def test_generated_markers_only_in_leading_comments(content, generated):
+    """Test that generated-code markers only count in the comments before the code."""
+    marked = GENERATED_MARKERS.search(LicenseManager.leading_comments(content))
+    assert bool(marked) is generated
+
+
+@pytest.mark.parametrize("operation", ["process_file", "update_years", "check_license"])
+def test_invalid_path_is_an_error_result(operation):
+    """Test that a path with an embedded NUL byte gives an ERROR result, not an exception."""
+    manager = _year_manager(2026)
+
+    result = getattr(manager, operation)("a\0.py")
+
+    assert result.status is LicenseStatus.ERROR
+    assert result.reason == "invalid-path"
+
+
+def test_process_many_with_duplicate_and_aliased_paths(tmp_path):
+    """
+    Test that a file listed several times, under other names or through a link,
+    gets a single header with parallel workers, as with a serial run.
+    """
+    manager = LicenseManager("MIT License")
+    (tmp_path / "links").mkdir()
+    paths = []
+    for index in range(40):
+        name = f"file{index}.py"
+        (tmp_path / name).write_text("x = 1\n")
+        (tmp_path / "links" / name).symlink_to(tmp_path / name)
+        paths += [
+            str(tmp_path / name),
+            os.path.join(str(tmp_path), ".", name),
+            str(tmp_path / "links" / name),
+        ]
+
+    results = list(manager.process_many(paths, jobs=8))
+
+    assert sum(result.status is LicenseStatus.ADDED for result in results) == 40
+    for index in range(40):
+        assert (tmp_path / f"file{index}.py").read_text().count("MIT License") == 1
+    assert LicenseManager._file_locks == {}
+
+
+def test_process_many_yields_records_in_order(tmp_path):
+    """
+    Test that process_many yields one record per path, in order, with the bytes
+    and duration of each file, and without printing anything.
+    """
+    manager = LicenseManager("MIT License", detail=True)
+    paths = []
+    for index in range(20):
+        path = tmp_path / f"file{index}.py"
+        path.write_text(f"x = {index}\n")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "notes.txt"))
+
+    with patch("builtins.print") as mock_print:
+        results = list(manager.process_many(iter(paths), jobs=4))
+
+    mock_print.assert_not_called()
+    assert [result.path for result in results] == paths
+    assert [result.status for result in results] == [LicenseStatus.ADDED] * 20 + [
+        LicenseStatus.SKIPPED
+    ]
+    for path, result in zip(paths, results[:-1]):
+        assert result.bytes_written == os.path.getsize(path)
+        assert result.bytes_read > 0
+        assert result.duration > 0
+    assert results[-1].reason == "unsupported"
+
+
+def test_process_many_with_operation(tmp_path):
+    """Test that process_many applies the given operation, e.g. check_license."""
+    manager = LicenseManager("MIT License")
+    path = tmp_path / "file.py"
+    path.write_text("x = 1\n")
+
+    results = list(manager.process_many([str(path)], operation=manager.check_license))
+
+    assert results[0].status is LicenseStatus.MISSING
+    assert results[0].bytes_written == 0
+
+
+def test_crlf_and_bom_are_preserved(tmp_path):
+    """
+    Test that the header follows the newline of the file and goes after its BOM,
+    and that the body is kept byte-for-byte.
+    """
+    manager = LicenseManager("MIT License\nCopyright (c) 2015 - 2024 John Wick")
+    files = {
+        "crlf.py": b"x = 1\r\ny = 2\r\n",
+        "bom.py": codecs.BOM_UTF8 + b"x = 1\n",
+        "bom_crlf.js": codecs.BOM_UTF8 + "var s = 'é';\r\n".encode("utf-8"),
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_bytes(content)
+        assert manager.process_file(str(tmp_path / name)).status is LicenseStatus.ADDED
+
+    crlf = (tmp_path / "crlf.py").read_bytes()
+    assert crlf == b"# MIT License\r\n# Copyright (c) 2015 - 2024 John Wick\r\n" + files["crlf.py"]
+
+    bom = (tmp_path / "bom.py").read_bytes()
+    assert bom == codecs.BOM_UTF8 + b"# MIT License\n# Copyright (c) 2015 - 2024 John Wick\n" + (
+        b"x = 1\n"
+    )
+
+    bom_crlf = (tmp_path / "bom_crlf.js").read_bytes()
+    assert bom_crlf.startswith(codecs.BOM_UTF8 + b"/*\r\n * MIT License\r\n")
+    assert bom_crlf.endswith(files["bom_crlf.js"][3:])
+
+    # The headers are recognized as they were written
+    for name in files:
+        assert manager.process_file(str(tmp_path / name)).status is LicenseStatus.PRESENT
+        assert manager.check_license(str(tmp_path / name)).status is LicenseStatus.PRESENT
+
+
+def test_utf16_files(tmp_path):
+    """Test that UTF-16 files with a BOM get a header in their encoding, and can be updated."""
+    manager = LicenseManager(
+        "MIT License\nCopyright (c) 2015 - 2024 John Wick",
+        copyright_pattern=re.compile(
+            rb"Copyright \(c\) (?P<start_year>\d{4}) - (?P<end_year>\d{4}) John Wick"
+        ),
+        end_year=2025,
+    )
+    path = tmp_path / "script.py"
+    body = "print('héllo')\r\n".encode("utf-16-le")
+    path.write_bytes(codecs.BOM_UTF16_LE + body)
+
+    assert manager.check_license(str(path)).status is LicenseStatus.MISSING
+    assert manager.process_file(str(path)).status is LicenseStatus.ADDED
+    content = path.read_bytes()
+    assert content.startswith(codecs.BOM_UTF16_LE)
+    assert content.endswith(body)
+    assert content.decode("utf-16").startswith(
+        "# MIT License\r\n# Copyright (c) 2015 - 2024 John Wick\r\n"
+    )
+
+    assert manager.check_license(str(path)).status is LicenseStatus.STALE
+    assert manager.update_years(str(path)).status is LicenseStatus.UPDATED
+    assert "2015 - 2025" in path.read_bytes().decode("utf-16")
+    assert path.read_bytes().endswith(body)
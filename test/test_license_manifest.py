@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseManifest class.
+
+Tested functionalities include:
+- Saving and loading the manifest entries.
+- Invalidating the manifest when the license configuration changes.
+- Skipping unchanged files in LicenseManager without opening them.
+- Not trusting the entries of a plain run when the years are updated or checked.
+"""
+import os
+import re
+from unittest.mock import patch
+from src.license_manager import LicenseManager, LicenseStatus
+from src.license_manifest import LicenseManifest
+
+LICENSE_TEXT = "MIT License\nCopyright 2015-2024 Microsoft Corporation"
+
+
+def test_manifest_round_trip(tmp_path):
+    """Test that recorded entries survive a save and load with the same configuration."""
+    source = tmp_path / "test.py"
+    source.write_text("print('hello')\n")
+    manifest_file = str(tmp_path / "manifest.json")
+
+    manifest = LicenseManifest(manifest_file, "config")
+    manifest.record(str(source), os.stat(source), "header")
+    manifest.save()
+
+    reloaded = LicenseManifest(manifest_file, "config")
+    assert reloaded.is_unchanged(str(source), os.stat(source), "header")
+    assert not reloaded.is_unchanged(str(source), os.stat(source), "other header")
+
+
+def test_manifest_invalidated_by_config_change(tmp_path):
+    """Test that a different license configuration discards the stored entries."""
+    source = tmp_path / "test.py"
+    source.write_text("print('hello')\n")
+    manifest_file = str(tmp_path / "manifest.json")
+
+    manifest = LicenseManifest(manifest_file, "config")
+    manifest.record(str(source), os.stat(source), "header")
+    manifest.save()
+
+    assert LicenseManifest(manifest_file, "new config").entries == {}
+
+
+def test_manifest_detects_modified_file(tmp_path):
+    """Test that a file modified after it was recorded is no longer unchanged."""
+    source = tmp_path / "test.py"
+    source.write_text("print('hello')\n")
+    manifest = LicenseManifest(str(tmp_path / "manifest.json"), "config")
+    manifest.record(str(source), os.stat(source), "header")
+
+    source.write_text("print('hello, world')\n")
+
+    assert not manifest.is_unchanged(str(source), os.stat(source), "header")
+
+
+def test_license_manager_skips_unchanged_files(tmp_path):
+    """Test that a warm run does not open files recorded by the previous run."""
+    source = tmp_path / "test.py"
+    source.write_text("print('hello')\n")
+    manifest_file = str(tmp_path / "manifest.json")
+    config_hash = LicenseManifest.fingerprint(LICENSE_TEXT)
+
+    manifest = LicenseManifest(manifest_file, config_hash)
+    manager = LicenseManager(LICENSE_TEXT, manifest=manifest)
+    assert manager.check_and_add_license(str(source)) is LicenseStatus.ADDED
+    manifest.save()
+
+    manager = LicenseManager(LICENSE_TEXT, manifest=LicenseManifest(manifest_file, config_hash))
+    with patch("builtins.open") as mock_file:
+        assert manager.check_and_add_license(str(source)) is LicenseStatus.PRESENT
+        mock_file.assert_not_called()
+
+
+def test_update_years_ignores_entries_of_plain_runs(tmp_path):
+    """Test that a file recorded by a plain run still gets its years updated."""
+    source = tmp_path / "test.py"
+    source.write_text("# MIT License\n# Copyright (c) 2020 - 2024 Wick Dynex\nprint(1)\n")
+    license_text = "MIT License\nCopyright (c) 2020 - 2026 Wick Dynex"
+    manifest = LicenseManifest(str(tmp_path / "manifest.json"), "config")
+
+    manager = LicenseManager(license_text, manifest=manifest)
+    assert manager.process_file(str(source)).status is LicenseStatus.PRESENT
+
+    manager = LicenseManager(
+        license_text,
+        manifest=manifest,
+        copyright_pattern=re.compile(
+            rb"Copyright \(c\) (?P<start_year>\d{4}) - (?P<end_year>\d{4}) Wick Dynex"
+        ),
+        end_year=2026,
+    )
+    assert manager.update_years(str(source)).status is LicenseStatus.UPDATED
+    assert b"2020 - 2026" in source.read_bytes()
+    assert manager.update_years(str(source)).status is LicenseStatus.PRESENT
+
+
+def test_check_ignores_entries_of_plain_runs(tmp_path):
+    """Test that a file recorded by a plain run is still reported as stale by a check."""
+    source = tmp_path / "test.py"
+    source.write_text("# MIT License\n# Copyright (c) 2020 - 2024 Wick Dynex\nprint(1)\n")
+    license_text = "MIT License\nCopyright (c) 2020 - 2026 Wick Dynex"
+    manifest = LicenseManifest(str(tmp_path / "manifest.json"), "config")
+
+    manager = LicenseManager(license_text, manifest=manifest)
+    assert manager.process_file(str(source)).status is LicenseStatus.PRESENT
+
+    manager = LicenseManager(
+        license_text,
+        manifest=manifest,
+        copyright_pattern=re.compile(
+            rb"Copyright \(c\) (?P<start_year>\d{4}) - (?P<end_year>\d{4}) Wick Dynex"
+        ),
+        end_year=2026,
+    )
+    assert manager.check_license(str(source)).status is LicenseStatus.STALE
@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the bounded stages of license_pipeline.
+
+Tested functionalities include:
+- Keeping the order of the items.
+- Producing at most a bounded number of items ahead of the consumer.
+- Raising the exceptions of the producer in the consumer.
+- Stopping the producer when the consumer stops early.
+- Processing items in parallel while keeping the results in input order.
+"""
+import threading
+import time
+import pytest
+from src.license_pipeline import ordered_map, prefetch
+
+
+def test_prefetch_keeps_order():
+    """Test that every item is produced once, in order."""
+    assert list(prefetch(iter(range(10_000)), 16)) == list(range(10_000))
+    assert list(prefetch([])) == []
+
+
+def test_prefetch_is_bounded():
+    """Test that the producer never runs more than the buffer size ahead."""
+    produced = []
+    lock = threading.Lock()
+
+    def items():
+        for index in range(1000):
+            with lock:
+                produced.append(index)
+            yield index
+
+    for consumed, item in enumerate(prefetch(items(), 8)):
+        with lock:
+            # the buffer, plus the item waiting to be put and the one yielded
+            assert len(produced) <= consumed + 8 + 2
+        assert item == consumed
+
+
+def test_prefetch_raises_producer_errors():
+    """Test that an exception of the producer is raised in the consumer, after its items."""
+    def items():
+        yield 1
+        yield 2
+        raise SystemExit(1)
+
+    consumed = []
+    with pytest.raises(SystemExit):
+        for item in prefetch(items(), 4):
+            consumed.append(item)
+    assert consumed == [1, 2]
+
+
+def test_prefetch_stops_producer_when_consumer_stops():
+    """Test that closing the consumer ends the producer thread."""
+    finished = threading.Event()
+
+    def items():
+        try:
+            index = 0
+            while True:
+                yield index
+                index += 1
+        finally:
+            finished.set()
+
+    stream = prefetch(items(), 4)
+    assert next(stream) == 0
+    stream.close()
+    assert finished.wait(5)
+
+
+def test_ordered_map_keeps_input_order():
+    """Test that results come back in input order even when later items finish first."""
+
+    def slow_for_small(value):
+        time.sleep(0.001 * (20 - value))
+        return value * 2
+
+    assert list(ordered_map(slow_for_small, range(20), jobs=4)) == [
+        value * 2 for value in range(20)
+    ]
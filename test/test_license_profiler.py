@@ -0,0 +1,72 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the profiling hook.
+
+Tested functionalities include:
+- Writing a .pstats file with the CPU profile.
+- Printing the peak memory and top allocation sites with the memory profile.
+- Writing the profile even if the profiled function fails.
+"""
+import pstats
+import tracemalloc
+from unittest.mock import patch
+import pytest
+from src.license_profiler import profile_call
+
+
+def allocate(count):
+    """A function that allocates some memory."""
+    return len([str(i) for i in range(count)])
+
+
+def test_cpu_profile(tmp_path):
+    """Test that the CPU profile is written as a .pstats file covering the function."""
+    output = tmp_path / "run.pstats"
+
+    with patch("builtins.print"):
+        assert profile_call("cpu", str(output), allocate, 1000) == 1000
+
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert "allocate" in functions
+
+
+def test_mem_profile(tmp_path):
+    """Test that the memory profile prints the peak and stops tracing."""
+    with patch("builtins.print") as mock_print:
+        assert profile_call("mem", str(tmp_path / "unused"), allocate, 1000) == 1000
+
+    lines = [call.args[0] for call in mock_print.call_args_list]
+    assert lines[0].startswith("Peak traced memory: ")
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_written_on_failure(tmp_path):
+    """Test that the CPU profile is written even if the function raises."""
+    output = tmp_path / "run.pstats"
+
+    def fail():
+        raise SystemExit(1)
+
+    with patch("builtins.print"), pytest.raises(SystemExit):
+        profile_call("cpu", str(output), fail)
+
+    assert output.exists()
+
+
+def test_unknown_mode():
+    """Test that an unknown mode is rejected."""
+    with pytest.raises(ValueError):
+        profile_call("io", "unused", allocate, 1)
@@ -0,0 +1,98 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseRules class.
+
+Tested functionalities include:
+- Matching paths against folder, glob and anchored patterns.
+- Giving precedence to the first matching rule.
+- Loading a rules file and rejecting invalid ones.
+"""
+import json
+import os
+from unittest.mock import patch
+import pytest
+from src.license_rules import LicenseRule, LicenseRules
+
+
+def test_match_patterns():
+    """Test that folder, glob and anchored patterns select the right rule."""
+    rules = LicenseRules(
+        [
+            LicenseRule(("third_party/",), license_type="Apache License 2.0"),
+            LicenseRule(("*.proto", "/tools/*.py"), author="ACME Corp."),
+            LicenseRule(("internal",), start_year=2019),
+        ],
+        "/repo",
+    )
+
+    assert rules.match("/repo/third_party/lib/a.c") == 0
+    assert rules.match("/repo/src/third_party/a.c") == 0
+    assert rules.match("/repo/api/service.proto") == 1
+    assert rules.match("/repo/tools/build.py") == 1
+    assert rules.match("/repo/src/tools/build.py") is None
+    assert rules.match("/repo/internal/x/y.py") == 2
+    assert rules.match("/repo/src/main.py") is None
+
+
+def test_first_matching_rule_wins():
+    """Test that a path matched by several rules gets the first one."""
+    rules = LicenseRules(
+        [LicenseRule(("vendor/special/",)), LicenseRule(("vendor/",))], "/repo"
+    )
+
+    assert rules.match(os.path.join("/repo", "vendor", "special", "a.py")) == 0
+    assert rules.match(os.path.join("/repo", "vendor", "other", "a.py")) == 1
+
+
+def test_no_rules():
+    """Test that an empty rules file matches nothing."""
+    assert LicenseRules([], "/repo").match("/repo/a.py") is None
+
+
+def test_load(tmp_path):
+    """Test loading a rules file."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(
+        json.dumps(
+            {"rules": [{"paths": ["lib/"], "license_type": "MIT License", "end_year": 2023}]}
+        )
+    )
+
+    rules = LicenseRules.load(str(rules_file), str(tmp_path))
+
+    assert rules.rules == [LicenseRule(("lib/",), license_type="MIT License", end_year=2023)]
+    assert rules.match(str(tmp_path / "lib" / "a.py")) == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        {"rules": [{"license_type": "MIT License"}]},
+        {"rules": [{"paths": [], "license_type": "MIT License"}]},
+        {"rules": [{"paths": ["lib/"], "licence": "MIT License"}]},
+        {"rules": [{"paths": ["lib/"], "start_year": "2020"}]},
+    ],
+)
+def test_load_invalid(tmp_path, data):
+    """Test that an invalid rules file is reported as an error."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(data))
+
+    with patch("builtins.print") as mock_print, pytest.raises(SystemExit):
+        LicenseRules.load(str(rules_file), str(tmp_path))
+
+    assert mock_print.call_args[0][0].startswith("Error: ")
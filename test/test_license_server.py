@@ -0,0 +1,156 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseServer class.
+
+Tested functionalities include:
+- Answering check, add and update-years requests on a stream.
+- Reporting malformed requests with JSON-RPC errors.
+- Carrying out notifications without answering them.
+- Answering requests on a Unix socket.
+"""
+import io
+import json
+import re
+import socket
+import threading
+import time
+import pytest
+from src.license_manager import LicenseManager
+from src.license_server import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    LicenseServer,
+)
+
+LICENSE_TEXT = "MIT License\n\nCopyright (c) 2015 - 2024 John Wick"
+
+
+@pytest.fixture
+def server():
+    manager = LicenseManager(
+        LICENSE_TEXT,
+        copyright_pattern=re.compile(
+            rb"Copyright \(c\) (?P<start_year>\d{4}) - (?P<end_year>\d{4}) John Wick"
+        ),
+        end_year=2025,
+    )
+    return LicenseServer(lambda path: manager)
+
+
+def request(request_id, method, paths):
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": {"paths": paths}}
+    )
+
+
+def test_serve_stream(tmp_path, server):
+    """Test that check, add and update-years requests are answered in order."""
+    path = str(tmp_path / "a.py")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    infile = io.StringIO(
+        "\n".join(
+            [
+                request(1, "check", [path]),
+                request(2, "add", [path]),
+                "",
+                request(3, "update-years", [path]),
+                request(4, "check", [path]),
+            ]
+        )
+    )
+    outfile = io.StringIO()
+
+    server.serve_stream(infile, outfile)
+
+    responses = [json.loads(line) for line in outfile.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == [1, 2, 3, 4]
+    assert [response["result"][0]["status"] for response in responses] == [
+        "missing",
+        "added",
+        "updated",
+        "present",
+    ]
+    assert responses[1]["result"][0]["bytes_written"] > 0
+    assert "2015 - 2025" in (tmp_path / "a.py").read_text()
+
+
+@pytest.mark.parametrize(
+    "line, code",
+    [
+        ("{not json", PARSE_ERROR),
+        ("[1, 2]", INVALID_REQUEST),
+        (request(1, "remove", []), METHOD_NOT_FOUND),
+        ('{"id": 1, "method": "check"}', INVALID_REQUEST),
+        ('{"jsonrpc": "1.0", "id": 1, "method": "check"}', INVALID_REQUEST),
+        (
+            '{"jsonrpc": "2.0", "id": 1, "method": "check", "params": {"paths": "a.py"}}',
+            INVALID_PARAMS,
+        ),
+        (request(1, "check", [1]), INVALID_PARAMS),
+        (request(1, "add", ["a\0.py"]), INVALID_PARAMS),
+    ],
+)
+def test_errors(server, line, code):
+    """Test that malformed requests are answered with an error, not a crash."""
+    response = json.loads(server.handle_line(line))
+    assert response["error"]["code"] == code
+
+
+def test_notifications_are_not_answered(tmp_path, server):
+    """Test that a request without an id is carried out, but gets no response."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+    infile = io.StringIO(
+        "\n".join(
+            [
+                json.dumps({"jsonrpc": "2.0", "method": "add",
+                            "params": {"paths": [str(tmp_path / "a.py")]}}),
+                json.dumps({"jsonrpc": "2.0", "method": "remove"}),
+                request(1, "check", [str(tmp_path / "a.py")]),
+            ]
+        )
+    )
+    outfile = io.StringIO()
+
+    server.serve_stream(infile, outfile)
+
+    responses = [json.loads(line) for line in outfile.getvalue().splitlines()]
+    assert [response["id"] for response in responses] == [1]
+    assert (tmp_path / "a.py").read_text().startswith("# MIT License")
+
+
+def test_serve_socket(tmp_path, server):
+    """Test that requests are answered on a Unix socket."""
+    socket_path = str(tmp_path / "license.sock")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    thread = threading.Thread(target=server.serve_socket, args=(socket_path,), daemon=True)
+    thread.start()
+
+    client = socket.socket(socket.AF_UNIX)
+    for _ in range(100):
+        try:
+            client.connect(socket_path)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.01)
+    with client, client.makefile("rwb") as stream:
+        stream.write((request(7, "check", [str(tmp_path / "a.py")]) + "\n").encode())
+        stream.flush()
+        response = json.loads(stream.readline())
+
+    assert response["id"] == 7
+    assert response["result"][0]["status"] == "missing"
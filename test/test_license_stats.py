@@ -0,0 +1,134 @@
+# MIT License
+#
+# Copyright (c) 2024 - 2024 Wick Dynex
+#
+# Permission is hereby granted, free of charge,
+# to any person obtaining a copy of this software and associated documentation files
+# (the 'Software'),
+# to deal in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software
+# and to permit persons to whom the Software is furnished to do so
+#
+# The above copyright notice
+# and this permission notice
+# shall be included in all copies or substantial portions of the Software.
+"""
+Unit tests for the LicenseStats class.
+
+Tested functionalities include:
+- Merging the counters collected by several threads.
+- Retiring the counters of the threads that ended.
+- Computing the latency percentiles from the histogram.
+- Counting the files and bytes processed by LicenseManager.
+- Writing the report as JSON.
+"""
+import json
+import threading
+from src.license_manager import LicenseManager
+from src.license_stats import PHASES, LicenseStats
+
+LICENSE_TEXT = "MIT License\nCopyright 2015-2024 Microsoft Corporation"
+
+
+def test_counters_are_merged_across_threads():
+    """Test that the counters of every thread end up in the report."""
+    stats = LicenseStats()
+
+    def work():
+        for _ in range(100):
+            stats.add("bytes_read", 2)
+            stats.add_result("added", "", 1000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = stats.report()
+    assert report["files_seen"] == 400
+    assert report["modified"] == 400
+    assert report["bytes_read"] == 800
+
+
+def test_buckets_of_ended_threads_are_retired():
+    """Test that short-lived threads do not leave their buckets behind, nor lose counts."""
+    stats = LicenseStats()
+
+    def work():
+        stats.add_result("present", "", 1000)
+
+    for _ in range(500):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    assert len(stats._buckets) == 0
+    assert stats.report()["already_licensed"] == 500
+
+
+def test_latency_percentiles():
+    """Test that p50 and p99 are within one histogram bucket of the real values."""
+    stats = LicenseStats()
+    for _ in range(98):
+        stats.add_result("present", "", 1_000_000)
+    for _ in range(2):
+        stats.add_result("present", "", 100_000_000)
+
+    latency = stats.report()["latency_ms"]
+    assert 1.0 <= latency["p50"] < 1.1
+    assert 100.0 <= latency["p99"] < 110.0
+
+
+def test_empty_report():
+    """Test that a run without files gives zeros instead of failing."""
+    report = LicenseStats().report()
+    assert report["files_seen"] == 0
+    assert report["latency_ms"] == {"p50": 0.0, "p99": 0.0}
+    assert list(report["phase_seconds"]) == list(PHASES)
+
+
+def test_timed_iterable():
+    """Test that timing an iterable yields the same items."""
+    stats = LicenseStats()
+    assert list(stats.timed(iter([1, 2, 3]), "walk")) == [1, 2, 3]
+    assert stats.merged().phase_ns["walk"] > 0
+
+
+def test_license_manager_counts(tmp_path):
+    """Test that LicenseManager counts the files by status and the bytes it reads and writes."""
+    licensed = tmp_path / "licensed.py"
+    unlicensed = tmp_path / "unlicensed.py"
+    unlicensed.write_text("print('hello')\n")
+    binary = tmp_path / "binary.py"
+    binary.write_bytes(b"\0\1\2")
+
+    stats = LicenseStats()
+    license_manager = LicenseManager(LICENSE_TEXT, stats=stats)
+    licensed.write_bytes(license_manager.headers[license_manager.get_file_type(".py")
+                                                 .comment_style] + b"x = 1\n")
+    for path in (licensed, unlicensed, binary):
+        license_manager.process_file(str(path))
+
+    report = stats.report()
+    assert report["files_seen"] == 3
+    assert report["already_licensed"] == 1
+    assert report["modified"] == 1
+    assert report["skipped"] == {"binary": 1}
+    assert report["bytes_written"] == unlicensed.stat().st_size
+    assert report["bytes_read"] > 0
+    assert report["phase_seconds"]["format"] > 0
+    assert report["phase_seconds"]["write"] > 0
+
+
+def test_write_report(tmp_path):
+    """Test that the report is written as JSON."""
+    stats = LicenseStats()
+    stats.add_result("skipped", "oversize", 5000)
+    stats_file = tmp_path / "stats.json"
+
+    stats.write(str(stats_file))
+
+    report = json.loads(stats_file.read_text())
+    assert report["skipped"] == {"oversize": 1}
+    assert report["statuses"] == {"skipped": 1}